@@ -0,0 +1,133 @@
+"""Frame time and paint cost of the page animations in headless Chromium.
+
+Builds a stand-alone page per animation mode from the app's own ANIMATIONS
+styles (the dotted background, the waving hand, the blinking cursor and the
+hover cards, inside a page a few screens tall) and records, for a few seconds
+each, requestAnimationFrame frame times and the Paint / style / layout events
+from a Chromium trace. Each mode is measured at the top of the page, scrolled
+past the hero and with prefers-reduced-motion:
+
+    python benchmarks/animation.py [--seconds 5] [--json]
+
+Requires playwright with its Chromium (`pip install playwright && playwright
+install chromium`), or pass --chromium to use a locally installed binary.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from py_portfolio.py_portfolio import ANIMATIONS, PAUSE_OFFSCREEN_JS  # noqa: E402
+from py_portfolio.styles import Stylesheet  # noqa: E402
+
+VIEWPORT = {"width": 1280, "height": 800}
+TRACE_CATEGORIES = ["devtools.timeline", "disabled-by-default-devtools.timeline"]
+TRACE_EVENTS = {"Paint": "paints", "UpdateLayoutTree": "style_recalcs", "Layout": "layouts"}
+
+FRAME_SAMPLER_JS = """
+(seconds) => new Promise((resolve) => {
+    const frames = [];
+    let last = performance.now();
+    const end = last + seconds * 1000;
+    const tick = (now) => {
+        frames.push(now - last);
+        last = now;
+        if (now < end) requestAnimationFrame(tick); else resolve(frames);
+    };
+    requestAnimationFrame(tick);
+})
+"""
+
+
+def build_page(mode: str) -> str:
+    sheet = Stylesheet()
+    motion = ANIMATIONS[mode]
+    background, wave, cursor, hover = (sheet.add(motion[key]) for key in ("background", "wave", "cursor", "hover"))
+    cards = "".join(f'<div class="card {hover}">Project {i}</div>' for i in range(6))
+    sections = "".join(
+        f'<section><h2>Section {i}<span class="{cursor}">_</span></h2>{cards}</section>' for i in range(4)
+    )
+    script = PAUSE_OFFSCREEN_JS.replace("__SELECTOR__", f".{wave}, .{cursor}") if mode == "compositor" else ""
+    return f"""<!doctype html>
+<html class="dark"><head><style>
+body {{ margin: 0; background: #15171b; color: white; font-family: sans-serif; }}
+section {{ min-height: 100vh; padding: 2rem; }}
+.card {{ display: inline-block; width: 300px; height: 200px; margin: 1rem; background: #333; }}
+{sheet.render()}</style></head>
+<body><div class="{background}">
+<header style="height: 100vh"><h1>Hi, I'm Lewis <span style="display: inline-block" class="{wave}">👋🏻</span></h1></header>
+{sections}
+</div><script>{script}</script></body></html>"""
+
+
+def summarize(frames: list[float], trace: dict, seconds: float) -> dict:
+    frames = sorted(frames[1:]) or [0.0]
+    counts = {name: 0 for name in TRACE_EVENTS.values()}
+    paint_ms = 0.0
+    for event in trace.get("traceEvents", []):
+        name = TRACE_EVENTS.get(event.get("name"))
+        if name and event.get("ph") in ("X", "B"):
+            counts[name] += 1
+            if name == "paints":
+                paint_ms += event.get("dur", 0) / 1000
+    return {
+        "fps": round(len(frames) / seconds, 1),
+        "frame_ms_p50": round(frames[len(frames) // 2], 2),
+        "frame_ms_p95": round(frames[min(len(frames) - 1, int(len(frames) * 0.95))], 2),
+        "long_frames": sum(1 for frame in frames if frame > 1000 / 60 * 1.5),
+        **{f"{name}_per_s": round(count / seconds, 1) for name, count in counts.items()},
+        "paint_ms_per_s": round(paint_ms / seconds, 2),
+    }
+
+
+async def measure(browser, mode: str, scenario: str, seconds: float) -> dict:
+    context = await browser.new_context(
+        viewport=VIEWPORT,
+        reduced_motion="reduce" if scenario == "reduced_motion" else "no-preference",
+    )
+    page = await context.new_page()
+    await page.set_content(build_page(mode))
+    if scenario == "scrolled":
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    await page.wait_for_timeout(500)
+    await browser.start_tracing(page, categories=TRACE_CATEGORIES)
+    frames = await page.evaluate(FRAME_SAMPLER_JS, seconds)
+    trace = json.loads(await browser.stop_tracing())
+    await context.close()
+    return summarize(frames, trace, seconds)
+
+
+async def run(args) -> dict:
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(executable_path=args.chromium)
+        try:
+            return {
+                mode: {
+                    scenario: await measure(browser, mode, scenario, args.seconds)
+                    for scenario in ("top", "scrolled", "reduced_motion")
+                }
+                for mode in ANIMATIONS
+            }
+        finally:
+            await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="sampling time per scenario")
+    parser.add_argument("--chromium", help="path to a local Chromium/Chrome binary")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for mode, scenarios in results.items():
+            for scenario, result in scenarios.items():
+                print(f"{mode:>10} {scenario:<15}" + "  ".join(f"{key}={value}" for key, value in result.items()))
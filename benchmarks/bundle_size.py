@@ -0,0 +1,250 @@
+"""First-load JavaScript per route, attributed to the components and icons the page uses.
+
+Reads a Next build of the compiled frontend made with browser source maps,
+works out which chunks each route loads first (build-manifest.json), and
+uses the source maps to attribute every byte of those chunks to the module
+it came from. Bytes are then grouped by the components and icons in the
+landing page's component tree (Radix Themes components, lucide icons, ...)
+and the remaining packages (react-dom, next, socket.io, ...):
+
+    reflex export --frontend-only --no-zip     # compiles .web
+    python benchmarks/bundle_size.py --build [--output report.json]
+
+Sections the page loads lazily (py_portfolio.lazy) are reported separately
+with their own chunks (react-loadable-manifest.json), since they are not
+part of any route's first load.
+
+--build rebuilds .web with source maps into .web/.next-analyze, leaving the
+export untouched; without it an existing build there is analyzed. Fails if
+a route's gzipped first-load JS is over its budget (`bundle_budgets` in
+rxconfig.py) or if any lucide icon other than the page's is bundled.
+"""
+import argparse
+import gzip
+import json
+import re
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from reflex.config import get_config
+from reflex.utils import prerequisites
+from reflex.utils.format import to_kebab_case
+
+from page_size import walk  # noqa: E402
+from py_portfolio import py_portfolio  # noqa: E402
+
+DIST_DIR = ".next-analyze"
+B64 = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+ICON_LIBRARY = "lucide-react"
+THEMES_LIBRARY = "@radix-ui/themes"
+
+
+def build(web_dir: Path) -> None:
+    """Run `next build` with browser source maps into DIST_DIR, restoring next.config.js after."""
+    config_file = web_dir / "next.config.js"
+    original = config_file.read_text()
+    # Later keys win, so this overrides the export's output and distDir.
+    config_file.write_text(
+        original.rstrip().removesuffix("};")
+        + f', productionBrowserSourceMaps: true, distDir: "{DIST_DIR}", output: undefined}};'
+    )
+    try:
+        subprocess.run([prerequisites.get_package_manager(), "run", "export"], cwd=web_dir, check=True)
+    finally:
+        config_file.write_text(original)
+
+
+def _vlq(segment: str) -> list[int]:
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = B64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value = shift = 0
+    return values
+
+
+def attribute(code: str, source_map: dict) -> Counter:
+    """Bytes of generated `code` per original source, from the map's mappings."""
+    sources = source_map["sources"]
+    lines = code.split("\n")
+    sizes: Counter = Counter()
+    source = 0
+    mappings = source_map["mappings"].split(";")
+    for index, line in enumerate(lines):
+        mapping = mappings[index] if index < len(mappings) else ""
+        column = 0
+        spans = []
+        for segment in filter(None, mapping.split(",")):
+            values = _vlq(segment)
+            column += values[0]
+            if len(values) > 1:
+                source += values[1]
+                spans.append((column, sources[source]))
+            else:
+                spans.append((column, None))
+        sizes[None] += len(line[: spans[0][0] if spans else len(line)].encode())
+        for (start, name), (end, _) in zip(spans, [*spans[1:], (len(line), None)]):
+            sizes[name] += len(line[start:end].encode())
+    sizes[None] += len(lines) - 1  # newlines
+    return sizes
+
+
+def module_path(source: str | None) -> str:
+    """`node_modules/<package>/...` sources by package path, the app's own by `app/...`."""
+    if source is None:
+        return "(unmapped)"
+    if "node_modules/" in source:
+        return source.rsplit("node_modules/", 1)[1]
+    path = re.sub(r"^(webpack://[^/]*/)?(\./)?", "", source)
+    # webpack's own runtime is listed as webpack/bootstrap etc.
+    return path if path.startswith("webpack/") else f"app/{path}"
+
+
+def package(path: str) -> str:
+    parts = path.split("/")
+    return "/".join(parts[:2]) if path.startswith("@") else parts[0]
+
+
+def page_components() -> dict[str, str]:
+    """Component name -> the module path prefix its code lives under, for the landing page."""
+    components = {}
+    for component in walk(py_portfolio.landing()):
+        library, tag = getattr(component, "library", None), getattr(component, "tag", None)
+        if not library or not tag:
+            continue
+        library = re.sub(r"(?<=.)@.*", "", library)
+        if library == ICON_LIBRARY:
+            name = to_kebab_case(tag.removesuffix("Icon"))
+            components[f"icon:{name}"] = f"{ICON_LIBRARY}/dist/esm/icons/{name}."
+        elif library == THEMES_LIBRARY:
+            name = to_kebab_case(tag.split(".")[0])
+            components[f"{THEMES_LIBRARY}:{name}"] = f"{THEMES_LIBRARY}/dist/esm/components/{name}."
+        elif library.startswith("next/"):
+            components[library] = f"next/dist/client/{library.removeprefix('next/')}."
+        elif library != "react":
+            components[library] = f"{library}/"
+    return components
+
+
+def _icon_key(name: str) -> str:
+    return name.replace("-", "").lower()
+
+
+def analyze(dist: Path) -> dict:
+    manifest = json.loads((dist / "build-manifest.json").read_text())
+    pages = manifest["pages"]
+    budgets = getattr(get_config(), "bundle_budgets", None) or {}
+    components = page_components()
+    used_icons = {_icon_key(name.removeprefix("icon:")) for name in components if name.startswith("icon:")}
+
+    routes = {}
+    failures = []
+    for route in sorted(pages):
+        if route.startswith("/_"):
+            continue
+        chunks = [file for file in dict.fromkeys([*pages.get("/_app", []), *pages[route]]) if file.endswith(".js")]
+        modules: Counter = Counter()
+        raw = gzipped = 0
+        for file in chunks:
+            data = (dist / file).read_bytes()
+            raw += len(data)
+            gzipped += len(gzip.compress(data))
+            map_file = dist / f"{file}.map"
+            if map_file.exists():
+                for source, size in attribute(data.decode(), json.loads(map_file.read_text())).items():
+                    modules[module_path(source)] += size
+            else:
+                modules["(no source map)"] += len(data)
+
+        by_component = {
+            name: sum(size for path, size in modules.items() if path.startswith(prefix))
+            for name, prefix in components.items()
+        }
+        claimed = tuple(components.values())
+        by_package: Counter = Counter()
+        for path, size in modules.items():
+            if not path.startswith(claimed):
+                by_package["app" if path.startswith("app/") else package(path)] += size
+
+        bundled_icons = {
+            _icon_key(Path(path).stem) for path in modules if path.startswith(f"{ICON_LIBRARY}/dist/esm/icons/")
+        }
+        # Importing the whole icon index instead of single icons would show up here too.
+        unexpected = sorted(bundled_icons - used_icons)
+        if unexpected:
+            failures.append(f"{route}: bundles icons the page doesn't use: {', '.join(unexpected)}")
+        budget = budgets.get(route)
+        if budget is not None and gzipped > budget:
+            failures.append(f"{route}: first-load JS is {gzipped} bytes gzipped, over its {budget} byte budget")
+
+        routes[route] = {
+            "chunks": chunks,
+            "first_load_js_bytes": raw,
+            "first_load_js_gzip": gzipped,
+            "budget_gzip": budget,
+            "components": dict(sorted(by_component.items(), key=lambda item: -item[1])),
+            "packages": dict(by_package.most_common()),
+            "icons": {"used": sorted(used_icons), "bundled": sorted(bundled_icons), "unexpected": unexpected},
+        }
+    return {"routes": routes, "lazy_chunks": lazy_chunks(dist), "failures": failures}
+
+
+def lazy_chunks(dist: Path) -> dict:
+    """Chunks of each lazily loaded section, fetched when it nears the viewport."""
+    loadable = dist / "react-loadable-manifest.json"
+    manifest = json.loads(loadable.read_text()) if loadable.exists() else {}
+    chunks = {}
+    for key, entry in sorted(manifest.items()):
+        if "components/lazy/" not in key:
+            continue
+        files = [file for file in entry.get("files", []) if file.endswith(".js")]
+        data = [(dist / file).read_bytes() for file in files]
+        chunks[key.rsplit("components/lazy/", 1)[1]] = {
+            "chunks": files,
+            "js_bytes": sum(map(len, data)),
+            "js_gzip": sum(len(gzip.compress(chunk)) for chunk in data),
+        }
+    return chunks
+
+
+def print_report(report: dict) -> None:
+    for route, result in report["routes"].items():
+        budget = f" (budget {result['budget_gzip']})" if result["budget_gzip"] else ""
+        print(f"{route}: {result['first_load_js_bytes']} bytes, {result['first_load_js_gzip']} gzipped{budget}")
+        for name, size in [*result["components"].items(), *result["packages"].items()]:
+            print(f"  {size:>9}  {name}")
+        print(f"  icons bundled: {', '.join(result['icons']['bundled']) or '-'}")
+    for name, result in report["lazy_chunks"].items():
+        print(f"lazy {name}: {result['js_bytes']} bytes, {result['js_gzip']} gzipped, loaded on approach")
+    for failure in report["failures"]:
+        print(f"FAIL {failure}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--build", action="store_true", help="rebuild .web with source maps first")
+    parser.add_argument("--output", help="write the report to this JSON file")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    web_dir = prerequisites.get_web_dir()
+    if args.build:
+        build(web_dir)
+    if not (web_dir / DIST_DIR / "build-manifest.json").exists():
+        parser.error(f"no build in {web_dir / DIST_DIR}, run with --build")
+    report = analyze(web_dir / DIST_DIR)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    sys.exit(1 if report["failures"] else 0)
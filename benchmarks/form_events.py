@@ -0,0 +1,115 @@
+"""Compare websocket events and server CPU per contact-form submission.
+
+"controlled" replays the old form, where every keystroke ran a setter on the
+server; "uncontrolled" is the current form, which sends one handle_submit
+carrying the field values. Events are processed in-process against the real
+State, with SMTP delivery swapped for a no-op:
+
+    python benchmarks/form_events.py [--submissions N] [--json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.update(
+    ENV_FILE=os.devnull,
+    GMAIL_ADDRESS="bench@example.com",
+    GMAIL_APP_PASSWORD="bench",
+    RECEIVER_EMAIL="bench@example.com",
+)
+
+import reflex as rx
+from reflex.state import Event
+
+from py_portfolio import contact, dedup, delivery  # noqa: E402
+from py_portfolio.outbox import Outbox  # noqa: E402
+from py_portfolio.py_portfolio import State  # noqa: E402
+from py_portfolio.ratelimit import limiter  # noqa: E402
+
+NAME = "Ada Lovelace"
+EMAIL = "ada@example.com"
+MESSAGE = ("I'd like to talk about a cloud security engagement. " * 10)[:500]
+
+
+class ControlledForm(rx.State):
+    """The form as it was before: every field bound with on_change."""
+
+    name: str = ""
+    email: str = ""
+    message: str = ""
+    status: str = ""
+
+    def handle_submit(self):
+        client = self.router.session.client_token
+        error = contact.check(self.name, self.email, self.message, client)
+        if error:
+            self.status = error
+            return
+        self.status, _ = contact.send(self.name, self.email, self.message)
+        self.name = self.email = self.message = ""
+
+
+def controlled_events() -> list[tuple[str, str, dict]]:
+    events = []
+    for field, value in (("name", NAME), ("email", EMAIL), ("message", MESSAGE)):
+        for i in range(1, len(value) + 1):
+            events.append((ControlledForm, f"set_{field}", {"value": value[:i]}))
+    events.append((ControlledForm, "handle_submit", {}))
+    return events
+
+
+def uncontrolled_events() -> list[tuple[str, str, dict]]:
+    form_data = {"name": NAME, "email": EMAIL, "message": MESSAGE}
+    return [(State, "handle_submit", {"form_data": form_data})]
+
+
+async def run(events, submissions: int) -> dict:
+    root = rx.State(_reflex_internal_init=True)
+    count = delta_bytes = 0
+    started = time.process_time()
+    for _ in range(submissions):
+        for state, handler, payload in events:
+            event = Event(token="bench", name=f"{state.get_full_name()}.{handler}", payload=payload)
+            async for update in root._process(event):
+                delta_bytes += len(json.dumps(update.delta, default=str))
+            count += 1
+    cpu = time.process_time() - started
+    return {
+        "events_per_submission": count / submissions,
+        "delta_bytes_per_submission": delta_bytes / submissions,
+        "cpu_ms_per_submission": round(cpu * 1000 / submissions, 3),
+    }
+
+
+async def main(submissions: int) -> dict:
+    limiter.configure({"enabled": False})
+    # Every run resubmits the same form; have each one go through in full.
+    dedup.submissions.configure({"ttl": 0})
+    delivery.queue = delivery.DeliveryQueue(outbox=Outbox(":memory:"), send=lambda submission, timeout: None)
+    results = {
+        "controlled": await run(controlled_events(), submissions),
+        "uncontrolled": await run(uncontrolled_events(), submissions),
+    }
+    await delivery.queue.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--submissions", type=int, default=20)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(main(args.submissions))
+    if args.json:
+        print(json.dumps(results))
+    else:
+        for mode, result in results.items():
+            print(mode)
+            for key, value in result.items():
+                print(f"  {key:>27}: {value}")
@@ -0,0 +1,144 @@
+"""Initial JavaScript and time to interactive of the page with and without lazy sections.
+
+Loads two builds of the site in headless Chromium, one compiled with
+PORTFOLIO_LAZY=0 and one with the default lazy sections, e.g. two static
+exports served on different ports:
+
+    PORTFOLIO_LAZY=0 PORTFOLIO_STATIC=1 reflex export --frontend-only --no-zip
+    ...
+    python benchmarks/lazy_sections.py --eager http://localhost:8001 --lazy http://localhost:8002 [--runs 5] [--json]
+
+Each load runs with the CPU throttled (4x by default, like a mid-range
+phone) and records the JavaScript fetched before the load event, First
+Contentful Paint, the long tasks on the main thread, Total Blocking Time
+and an estimate of Time to Interactive: the end of the last long task
+before a quiet window of five seconds, as Lighthouse defines it without
+the network condition. Then the page is scrolled to the bottom and every
+section has to have rendered, which also counts the JavaScript the lazy
+sections fetched on the way. Medians over --runs loads are reported.
+Exits non-zero if a section is missing after scrolling.
+
+Requires playwright with its Chromium (`pip install playwright && playwright
+install chromium`), or pass --chromium to use a locally installed binary.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+
+from playwright.async_api import async_playwright
+
+VIEWPORT = {"width": 412, "height": 915}
+QUIET_WINDOW_MS = 5000
+# Text that is only on the page once each below-the-fold section has rendered.
+SECTIONS = {"whoami": "whoami", "skills": "CloudFormation", "cloud_security": "Certifications", "contact": "Send"}
+
+LONG_TASKS_JS = """
+window.__longTasks = [];
+new PerformanceObserver((list) => {
+    for (const entry of list.getEntries()) window.__longTasks.push([entry.startTime, entry.duration]);
+}).observe({ type: "longtask", buffered: true });
+"""
+
+METRICS_JS = """
+(quietWindow) => {
+    const navigation = performance.getEntriesByType("navigation")[0];
+    const fcp = performance.getEntriesByName("first-contentful-paint")[0];
+    const start = fcp ? fcp.startTime : navigation.domContentLoadedEventEnd;
+    const tasks = window.__longTasks.filter(([startTime]) => startTime >= start);
+    let tti = Math.max(start, navigation.domContentLoadedEventEnd);
+    for (const [startTime, duration] of tasks) {
+        if (startTime - tti >= quietWindow) break;
+        tti = Math.max(tti, startTime + duration);
+    }
+    const scripts = performance.getEntriesByType("resource").filter(
+        (entry) => entry.initiatorType === "script" || entry.name.split("?")[0].endsWith(".js")
+    );
+    const before = scripts.filter((entry) => entry.responseEnd <= navigation.loadEventEnd);
+    return {
+        js_requests: before.length,
+        js_bytes: before.reduce((total, entry) => total + entry.encodedBodySize, 0),
+        fcp_ms: start,
+        tti_ms: tti,
+        long_tasks: tasks.length,
+        tbt_ms: tasks
+            .filter(([startTime]) => startTime < tti)
+            .reduce((total, [, duration]) => total + Math.max(0, duration - 50), 0),
+    };
+}
+"""
+
+SCROLLED_JS = """
+() => {
+    const navigation = performance.getEntriesByType("navigation")[0];
+    return performance.getEntriesByType("resource")
+        .filter((entry) => entry.startTime > navigation.loadEventEnd && entry.name.split("?")[0].endsWith(".js"))
+        .reduce((total, entry) => total + entry.encodedBodySize, 0);
+}
+"""
+
+
+async def load(browser, url: str, throttling: float) -> dict:
+    context = await browser.new_context(viewport=VIEWPORT, is_mobile=True)
+    page = await context.new_page()
+    cdp = await context.new_cdp_session(page)
+    await cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+    await cdp.send("Emulation.setCPUThrottlingRate", {"rate": throttling})
+    await page.add_init_script(LONG_TASKS_JS)
+    await page.goto(url, wait_until="load")
+    # TTI needs a quiet window after the last long task to be known.
+    await page.wait_for_timeout(QUIET_WINDOW_MS + 1000)
+    result = await page.evaluate(METRICS_JS, QUIET_WINDOW_MS)
+
+    height = await page.evaluate("document.body.scrollHeight")
+    for _ in range(0, height + VIEWPORT["height"], VIEWPORT["height"] // 2):
+        await page.mouse.wheel(0, VIEWPORT["height"] // 2)
+        await page.wait_for_timeout(100)
+    await page.wait_for_timeout(1000)
+    result["scrolled_js_bytes"] = await page.evaluate(SCROLLED_JS)
+    text = await page.evaluate("document.body.innerText")
+    result["missing_sections"] = [name for name, marker in SECTIONS.items() if marker not in text]
+    await context.close()
+    return result
+
+
+def median(runs: list[dict]) -> dict:
+    keys = [key for key in runs[0] if key != "missing_sections"]
+    summary = {key: round(statistics.median(run[key] for run in runs), 1) for key in keys}
+    summary["missing_sections"] = sorted({name for run in runs for name in run["missing_sections"]})
+    return summary
+
+
+async def run(args) -> dict:
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(executable_path=args.chromium)
+        try:
+            results = {}
+            for name, url in (("eager", args.eager), ("lazy", args.lazy)):
+                results[name] = median([await load(browser, url, args.throttling) for _ in range(args.runs)])
+            return results
+        finally:
+            await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--eager", required=True, help="URL of the build with PORTFOLIO_LAZY=0")
+    parser.add_argument("--lazy", required=True, help="URL of the build with lazy sections")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--throttling", type=float, default=4.0, help="CPU slowdown factor")
+    parser.add_argument("--chromium", help="path to a local Chromium/Chrome binary")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for name, result in results.items():
+            print(f"{name:>5} " + "  ".join(f"{key}={value}" for key, value in result.items()))
+        eager, lazy = results["eager"], results["lazy"]
+        js, tti = lazy["js_bytes"] - eager["js_bytes"], lazy["tti_ms"] - eager["tti_ms"]
+        print(f"lazy vs eager: initial JS {js:+.0f} bytes, TTI {tti:+.0f} ms")
+    sys.exit(1 if any(result["missing_sections"] for result in results.values()) else 0)
@@ -0,0 +1,311 @@
+"""Load test for page load and contact-form submission.
+
+Starts a local SMTP stand-in and the app (`reflex run --env prod`), then
+simulates concurrent visitors: each loads `/`, opens the state websocket and
+hydrates; a share of them fill in the form and submit it. Reports throughput,
+p50/p95/p99 latencies, backend memory per connected client and SMTP sessions
+used, and writes the results as JSON so runs can be compared across commits:
+
+    python benchmarks/loadtest.py --visitors 100 --submit-share 0.2 --output run.json
+    python benchmarks/loadtest.py --compare before.json after.json
+
+Requires aiosmtpd, websockets and httpx. Pass --frontend-url/--backend-url to
+test an app that is already running instead (SMTP and memory figures then
+only cover what this process can see).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+import psutil
+import websockets
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import reflex as rx
+
+from py_portfolio import delivery  # noqa: E402
+from py_portfolio.py_portfolio import State  # noqa: E402
+
+ROUTER_DATA = {"pathname": "/", "query": {}, "asPath": "/"}
+NAMESPACE = "/_event"
+
+
+class SMTPStandIn:
+    """aiosmtpd handler that accepts any login and counts sessions and messages."""
+
+    def __init__(self) -> None:
+        self.sessions = 0
+        self.messages = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages += 1
+        return "250 OK"
+
+
+def accept_any_login(server, session, envelope, mechanism, auth_data):
+    return AuthResult(success=True)
+
+
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def rank(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 2)
+
+    return {"count": len(ordered), "p50": rank(50), "p95": rank(95), "p99": rank(99)}
+
+
+def backend_rss(proc: psutil.Process | None) -> int:
+    """Resident memory of the Python processes in the app's process tree."""
+    if proc is None:
+        return 0
+    total = 0
+    for p in [proc, *proc.children(recursive=True)]:
+        try:
+            if "python" in p.name().lower() or "reflex" in p.name().lower():
+                total += p.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+class Visitor:
+    """Speaks just enough engine.io/socket.io to act like the Reflex frontend."""
+
+    def __init__(self, backend_url: str) -> None:
+        self.url = backend_url.replace("http", "ws", 1) + f"{NAMESPACE}/?EIO=4&transport=websocket"
+        self.token = uuid.uuid4().hex
+        self.ws = None
+
+    async def connect(self) -> None:
+        self.ws = await websockets.connect(self.url, max_size=None)
+        await self.ws.recv()  # engine.io open packet
+        await self.ws.send(f"40{NAMESPACE},")
+        while not (await self.ws.recv()).startswith(f"40{NAMESPACE}"):
+            pass
+
+    async def emit(self, name: str, payload: dict) -> None:
+        event = {"name": name, "payload": payload, "router_data": ROUTER_DATA, "token": self.token}
+        await self.ws.send(f"42{NAMESPACE}," + json.dumps(["event", event]))
+
+    async def updates(self):
+        """Yield state updates, answering engine.io pings on the way."""
+        while True:
+            packet = await self.ws.recv()
+            if packet == "2":
+                await self.ws.send("3")
+            elif packet.startswith(f"42{NAMESPACE},"):
+                name, update = json.loads(packet[len(NAMESPACE) + 3 :])
+                if name == "event":
+                    yield update
+
+    async def wait_for(self, *texts: str) -> str:
+        """Wait for an update containing any of `texts`, re-emitting server events like a browser would."""
+        async for update in self.updates():
+            for event in update.get("events", []):
+                if event["name"].startswith(State.get_full_name()):
+                    await self.emit(event["name"], event.get("payload", {}))
+            body = json.dumps(update.get("delta", {}))
+            for text in texts:
+                if text in body:
+                    return text
+
+    async def close(self) -> None:
+        if self.ws is not None:
+            await self.ws.close()
+
+
+async def visit(args, client: httpx.AsyncClient, submitter: bool, connected: asyncio.Barrier, results: dict) -> None:
+    visitor = Visitor(args.backend_url)
+    try:
+        started = time.perf_counter()
+        response = await client.get(args.frontend_url + "/")
+        response.raise_for_status()
+        results["page_load"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await visitor.connect()
+        await visitor.emit(f"{rx.State.get_full_name()}.hydrate", {})
+        await visitor.wait_for("is_hydrated")
+        results["hydrate"].append(time.perf_counter() - started)
+    except Exception as e:
+        results["errors"].append(f"load: {e!r}")
+        await visitor.close()
+        await connected.wait()
+        return
+
+    await connected.wait()
+    try:
+        if submitter:
+            message = "Load test message from a simulated visitor. " * 4
+            # Typing happens in the browser and costs the server nothing.
+            await asyncio.sleep(len(message) * args.keystroke_ms / 1000)
+            started = time.perf_counter()
+            form_data = {"name": "Load Test", "email": f"{visitor.token[:8]}@example.com", "message": message}
+            await visitor.emit(f"{State.get_full_name()}.handle_submit", {"form_data": form_data})
+            await visitor.wait_for(delivery.STATUS_QUEUED)
+            results["submit"].append(time.perf_counter() - started)
+            outcome = await asyncio.wait_for(visitor.wait_for(delivery.STATUS_SENT, "Failed"), args.delivery_timeout)
+            if outcome == delivery.STATUS_SENT:
+                results["delivery"].append(time.perf_counter() - started)
+            else:
+                results["errors"].append("delivery failed")
+    except Exception as e:
+        results["errors"].append(f"submit: {e!r}")
+    finally:
+        await visitor.close()
+
+
+async def wait_until_up(url: str, timeout: float = 600) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(url)).status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(1)
+    raise TimeoutError(f"{url} did not come up")
+
+
+def start_app(args, smtp_port: int, workdir: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(smtp_port),
+        "SMTP_STARTTLS": "0",
+        "GMAIL_ADDRESS": "loadtest@example.com",
+        "GMAIL_APP_PASSWORD": "loadtest",
+        "RECEIVER_EMAIL": "inbox@example.com",
+        "OUTBOX_PATH": str(Path(workdir) / "outbox.db"),
+        "ENV_FILE": os.devnull,
+        "PORTFOLIO_RATE_LIMITS": json.dumps({"enabled": False}),
+    }
+    command = [
+        "reflex", "run", "--env", "prod",
+        "--frontend-port", str(args.frontend_port),
+        "--backend-port", str(args.backend_port),
+    ]
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+
+
+async def run(args) -> dict:
+    handler = SMTPStandIn()
+    smtp = Controller(handler, hostname="127.0.0.1", port=args.smtp_port, authenticator=accept_any_login, auth_require_tls=False)
+    smtp.start()
+    app = None
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            if args.frontend_url is None:
+                args.frontend_url = f"http://localhost:{args.frontend_port}"
+                args.backend_url = f"http://localhost:{args.backend_port}"
+                app = start_app(args, args.smtp_port, workdir)
+            await wait_until_up(args.backend_url + "/ping")
+            await wait_until_up(args.frontend_url + "/")
+            backend = psutil.Process(app.pid) if app else None
+            await asyncio.sleep(2)
+            idle_rss = backend_rss(backend)
+
+            results = {"page_load": [], "hydrate": [], "submit": [], "delivery": [], "errors": []}
+            submitters = set(random.Random(0).sample(range(args.visitors), round(args.visitors * args.submit_share)))
+            connected = asyncio.Barrier(args.visitors + 1)
+            limits = httpx.Limits(max_connections=args.visitors)
+            async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+                started = time.perf_counter()
+                tasks = [
+                    asyncio.create_task(visit(args, client, i in submitters, connected, results))
+                    for i in range(args.visitors)
+                ]
+                await connected.wait()
+                connected_rss = backend_rss(backend)
+                await asyncio.gather(*tasks)
+                elapsed = time.perf_counter() - started
+        finally:
+            if app is not None:
+                app.terminate()
+                try:
+                    app.wait(30)
+                except subprocess.TimeoutExpired:
+                    app.kill()
+            smtp.stop()
+
+    return {
+        "commit": subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "params": {"visitors": args.visitors, "submit_share": args.submit_share, "keystroke_ms": args.keystroke_ms},
+        "throughput": {
+            "visitors_per_s": round(args.visitors / elapsed, 2),
+            "submits_per_s": round(len(results["submit"]) / elapsed, 2),
+        },
+        "latency_ms": {key: percentiles(results[key]) for key in ("page_load", "hydrate", "submit", "delivery")},
+        "memory": {
+            "backend_idle_mb": round(idle_rss / 2**20, 1),
+            "per_client_kb": round(max(connected_rss - idle_rss, 0) / args.visitors / 1024, 1) if backend else None,
+        },
+        "smtp": {"sessions": handler.sessions, "messages": handler.messages},
+        "errors": len(results["errors"]),
+    }
+
+
+def compare(before: dict, after: dict) -> None:
+    def flatten(data, prefix=""):
+        for key, value in data.items():
+            if isinstance(value, dict):
+                yield from flatten(value, f"{prefix}{key}.")
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield f"{prefix}{key}", value
+
+    old = dict(flatten(before))
+    print(f"{'metric':<32}{before.get('commit', 'before'):>12}{after.get('commit', 'after'):>12}{'change':>10}")
+    for key, value in flatten(after):
+        if key in old and not key.startswith("params."):
+            change = f"{(value - old[key]) / old[key] * 100:+.1f}%" if old[key] else ""
+            print(f"{key:<32}{old[key]:>12}{value:>12}{change:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visitors", type=int, default=50, help="concurrent simulated visitors")
+    parser.add_argument("--submit-share", type=float, default=0.2, help="share of visitors that submit the form")
+    parser.add_argument("--keystroke-ms", type=float, default=5.0, help="simulated typing speed")
+    parser.add_argument("--delivery-timeout", type=float, default=60.0)
+    parser.add_argument("--frontend-url")
+    parser.add_argument("--backend-url")
+    parser.add_argument("--frontend-port", type=int, default=3100)
+    parser.add_argument("--backend-port", type=int, default=8100)
+    parser.add_argument("--smtp-port", type=int, default=8025)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*(json.loads(Path(path).read_text()) for path in args.compare))
+        sys.exit()
+    if (args.frontend_url is None) != (args.backend_url is None):
+        parser.error("--frontend-url and --backend-url go together")
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
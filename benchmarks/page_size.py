@@ -0,0 +1,59 @@
+"""Measure the size of the compiled landing page.
+
+Reports the compiled page module, the modules of the sections it loads
+lazily (not part of the page's first load), the shared stylesheet, the number of
+components still carrying an inline style object, the number of components
+in the tree and the number of on_change bindings, so layout changes can be
+compared:
+
+    python benchmarks/page_size.py [--json]
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from reflex.compiler import compiler
+
+from py_portfolio import lazy, py_portfolio  # noqa: E402
+
+
+def walk(component):
+    """The component and its descendants, including the contents of lazy sections."""
+    yield component
+    if isinstance(component, lazy.LazySection):
+        yield from walk(lazy.sections[component.section._js_expr.removeprefix("Lazy_")])
+    for child in getattr(component, "children", []):
+        yield from walk(child)
+
+
+def measure() -> dict:
+    page = py_portfolio.landing()
+    _, code = compiler.compile_page("index", page, py_portfolio.State)
+    components = list(walk(page))
+    app = py_portfolio.app
+    sections = {
+        name: lazy.compile_section(section, py_portfolio.State, app.style, app.theme)
+        for name, section in lazy.sections.items()
+    }
+    return {
+        "page_js_bytes": len(code.encode()),
+        "lazy_js_bytes": sum(len(section.encode()) for section in sections.values()),
+        "lazy_sections": len(sections),
+        "shared_css_bytes": len(py_portfolio.sheet.render().encode()),
+        "inline_styles": code.count("css={"),
+        "components": len(components),
+        "on_change_bindings": sum(
+            1 for c in components if "on_change" in getattr(c, "event_triggers", {})
+        ),
+    }
+
+
+if __name__ == "__main__":
+    result = measure()
+    if "--json" in sys.argv:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f"{key:>18}: {value}")
@@ -0,0 +1,178 @@
+"""Event throughput of the backend with 1, 2, 4... workers sharing redis.
+
+For each worker count, starts the backend (`reflex run --env prod
+--backend-only` with REDIS_URL and GUNICORN_WORKERS set) and has concurrent
+visitors hydrate and send a run of state events. Every visitor then
+reconnects, which may land it on another worker, and checks that its state
+survived. Reports events per second, event latency and lost sessions:
+
+    python benchmarks/scaling.py --workers 1 2 4 --visitors 50 --events 20 [--json]
+
+Uses --redis-url if given, otherwise starts a throwaway `redis-server` from
+PATH, falling back to fakeredis's TCP server (single-threaded, so it caps
+the higher worker counts). Requires websockets and httpx, like loadtest.py.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import redis
+
+import reflex as rx
+
+# loadtest also puts the repo root on sys.path.
+from loadtest import ROOT, Visitor, percentiles, wait_until_up
+from py_portfolio.contact import STATUS_REQUIRED
+from py_portfolio.py_portfolio import State
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def redis_server(url: str | None):
+    """Yield the URL of a redis to use, starting a local one if none was given."""
+    if url:
+        yield url
+        return
+    port = free_port()
+    if shutil.which("redis-server"):
+        server = subprocess.Popen(
+            ["redis-server", "--port", str(port), "--save", "", "--appendonly", "no"],
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            yield f"redis://127.0.0.1:{port}"
+        finally:
+            server.terminate()
+            server.wait()
+        return
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(("127.0.0.1", port), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"redis://127.0.0.1:{port}"
+    finally:
+        server.shutdown()
+
+
+async def next_update(visitor: Visitor) -> dict:
+    async for update in visitor.updates():
+        return update
+
+
+async def visit(backend_url: str, events: int, results: dict) -> None:
+    visitor = Visitor(backend_url)
+    try:
+        await visitor.connect()
+        await visitor.emit(f"{rx.State.get_full_name()}.hydrate", {})
+        await visitor.wait_for("is_hydrated")
+        # Alternate two handlers so every event changes the state; end on the submit.
+        for i in range(events, 0, -1):
+            started = time.perf_counter()
+            if i % 2:
+                await visitor.emit(f"{State.get_full_name()}.handle_submit", {"form_data": {}})
+            else:
+                await visitor.emit(f"{State.get_full_name()}.on_mount", {})
+            await next_update(visitor)
+            results["event"].append(time.perf_counter() - started)
+        await visitor.close()
+
+        # A fresh websocket for the same token, as after a dropped connection.
+        await visitor.connect()
+        await visitor.emit(f"{rx.State.get_full_name()}.hydrate", {})
+        delta = json.dumps((await next_update(visitor)).get("delta", {}))
+        if STATUS_REQUIRED not in delta:
+            results["lost"] += 1
+    except Exception as e:
+        results["errors"].append(repr(e))
+    finally:
+        await visitor.close()
+
+
+def start_backend(port: int, workers: int, redis_url: str, workdir: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "REDIS_URL": redis_url,
+        "GUNICORN_WORKERS": str(workers),
+        "ENV_FILE": os.devnull,
+        "OUTBOX_PATH": str(Path(workdir) / "outbox.db"),
+        "PORTFOLIO_RATE_LIMITS": json.dumps({"enabled": False}),
+    }
+    command = ["reflex", "run", "--env", "prod", "--backend-only", "--backend-port", str(port)]
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+
+
+async def measure(args, workers: int, redis_url: str) -> dict:
+    redis.Redis.from_url(redis_url).flushall()
+    port = free_port()
+    backend_url = f"http://localhost:{port}"
+    with tempfile.TemporaryDirectory() as workdir:
+        backend = start_backend(port, workers, redis_url, workdir)
+        try:
+            await wait_until_up(backend_url + "/ping")
+            await asyncio.sleep(2)
+            results = {"event": [], "lost": 0, "errors": []}
+            started = time.perf_counter()
+            await asyncio.gather(*(visit(backend_url, args.events, results) for _ in range(args.visitors)))
+            elapsed = time.perf_counter() - started
+        finally:
+            backend.terminate()
+            try:
+                backend.wait(30)
+            except subprocess.TimeoutExpired:
+                backend.kill()
+    return {
+        "events_per_s": round(len(results["event"]) / elapsed, 1),
+        "latency_ms": percentiles(results["event"]),
+        "sessions_lost": results["lost"],
+        "errors": len(results["errors"]),
+    }
+
+
+async def run(args) -> dict:
+    with redis_server(args.redis_url) as redis_url:
+        results = {workers: await measure(args, workers, redis_url) for workers in args.workers}
+    baseline = results[args.workers[0]]["events_per_s"] or 1
+    for result in results.values():
+        result["speedup"] = round(result["events_per_s"] / baseline, 2)
+    return {
+        "params": {"visitors": args.visitors, "events": args.events, "cpus": os.cpu_count()},
+        "workers": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--visitors", type=int, default=50, help="concurrent simulated visitors")
+    parser.add_argument("--events", type=int, default=20, help="state events sent by each visitor")
+    parser.add_argument("--redis-url", help="use this redis instead of starting one")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for workers, stats in result["workers"].items():
+            latency = stats["latency_ms"]
+            print(
+                f"workers={workers:<3} events/s={stats['events_per_s']:<8} speedup={stats['speedup']:<6}"
+                f"p50={latency.get('p50')}ms p95={latency.get('p95')}ms "
+                f"lost={stats['sessions_lost']} errors={stats['errors']}"
+            )
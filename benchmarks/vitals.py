@@ -0,0 +1,203 @@
+"""Ingest rate and summary accuracy of the Web Vitals endpoint, with synthetic beacons.
+
+Sends beacons shaped like the page's (a view id, the route and a batch of
+metrics) for simulated page views on phones and desktops, some reporting a
+worse CLS again later, plus malformed and out-of-range ones. Then checks the
+percentiles from GET /api/vitals against the ones computed from what was
+sent, and compares batched inserts to one commit per beacon, through the
+endpoint and against the store alone.
+Exits non-zero if any check fails:
+
+    python benchmarks/vitals.py [--views 2000] [--json]
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from py_portfolio import vitals  # noqa: E402
+from py_portfolio.ratelimit import limiter  # noqa: E402
+
+USER_AGENTS = {
+    "mobile": "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148",
+    "desktop": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+}
+# Tablets count as desktop.
+TABLET = "Mozilla/5.0 (iPad; CPU OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Safari/604.1"
+ROUTES = ("/", "/404")
+# (median, spread) of a log-normal per metric and device; phones are slower.
+DISTRIBUTIONS = {
+    "TTFB": (200, 0.5),
+    "FCP": (900, 0.4),
+    "LCP": (1500, 0.5),
+    "INP": (120, 0.6),
+    "CLS": (0.05, 0.8),
+}
+JUNK = [
+    b"not json",
+    b"[]",
+    json.dumps({"route": "/", "metrics": [{"name": "LCP", "value": -1}]}).encode(),
+    json.dumps({"route": "/", "metrics": [{"name": "LCP", "value": 1e9}]}).encode(),
+    json.dumps({"route": "/", "metrics": [{"name": "FID", "value": 10}]}).encode(),
+    json.dumps({"route": "/", "metrics": [{"name": "CLS", "value": True}]}).encode(),
+    json.dumps({"route": "/", "metrics": [{"name": "LCP", "value": 1.0}] * 2000}).encode(),
+]
+
+
+def page_views(count: int, rng: random.Random) -> list[dict]:
+    views = []
+    for i in range(count):
+        device = rng.choice(list(USER_AGENTS))
+        slowdown = 1.8 if device == "mobile" else 1.0
+        values = {}
+        for name, (median, spread) in DISTRIBUTIONS.items():
+            value = rng.lognormvariate(0, spread) * median * (1 if name == "CLS" else slowdown)
+            values[name] = round(value, 4)
+        beacons = [dict(values)]
+        if rng.random() < 0.2:
+            # A layout shift after the first beacon, reported when the page is hidden again.
+            values["CLS"] = round(values["CLS"] + rng.random() * 0.2, 4)
+            beacons.append({"CLS": values["CLS"]})
+        route = rng.choice(ROUTES)
+        views.append({"view": f"view-{i}", "route": route, "device": device, "beacons": beacons, "final": values})
+    return views
+
+
+def expected_summary(views: list[dict]) -> dict:
+    samples: dict = {}
+    for view in views:
+        for name, value in view["final"].items():
+            samples.setdefault(view["route"], {}).setdefault(view["device"], {}).setdefault(name, []).append(value)
+    return {
+        route: {
+            device: {
+                name: {"count": len(values), **{f"p{p}": vitals.percentile(values, p) for p in vitals.PERCENTILES}}
+                for name, values in ((name, sorted(values)) for name, values in metrics.items())
+            }
+            for device, metrics in devices.items()
+        }
+        for route, devices in samples.items()
+    }
+
+
+async def post(client: httpx.AsyncClient, body: bytes, user_agent: str) -> int:
+    # sendBeacon sends a string body as text/plain.
+    headers = {"User-Agent": user_agent, "Content-Type": "text/plain"}
+    return (await client.post("/api/vitals", content=body, headers=headers)).status_code
+
+
+async def ingest(views: list[dict], flush_size: int, path: str) -> tuple[float, httpx.Response, int, list[int]]:
+    vitals._store = vitals.VitalsStore(path, flush_size=flush_size)
+    app = Starlette(
+        routes=[
+            Route("/api/vitals", vitals.vitals_endpoint, methods=["POST"]),
+            Route("/api/vitals", vitals.vitals_summary_endpoint, methods=["GET"]),
+        ]
+    )
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://portfolio") as client:
+        beacons = 0
+        started = time.perf_counter()
+        for view in views:
+            for values in view["beacons"]:
+                metrics = [{"name": name, "value": value} for name, value in values.items()]
+                body = json.dumps({"view": view["view"], "route": view["route"], "metrics": metrics}).encode()
+                await post(client, body, USER_AGENTS[view["device"]])
+                beacons += 1
+        elapsed = time.perf_counter() - started
+        junk = [await post(client, body, TABLET) for body in JUNK]
+        summary = await client.get("/api/vitals")
+    vitals._store.close()
+    return beacons / elapsed, summary, beacons, junk
+
+
+def store_rate(views: list[dict], flush_size: int, path: str) -> float:
+    """Rows per second VitalsStore.add takes, without the HTTP round trip."""
+    store = vitals.VitalsStore(path, flush_size=flush_size)
+    # Stamped now, so the flush interval doesn't force a write on every add.
+    created = time.time()
+    rows = [
+        [(created, view["view"], view["route"], view["device"], name, value, "") for name, value in values.items()]
+        for view in views
+        for values in view["beacons"]
+    ]
+    started = time.perf_counter()
+    for beacon in rows:
+        store.add(beacon)
+    store.flush()
+    elapsed = time.perf_counter() - started
+    store.close()
+    return sum(map(len, rows)) / elapsed
+
+
+async def run(count: int) -> dict:
+    # Every beacon comes from the same test client.
+    limiter.configure({"enabled": False})
+    views = page_views(count, random.Random(7))
+    failures = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        per_beacon, _, _, _ = await ingest(views, 1, str(Path(workdir) / "single.db"))
+        batched, response, beacons, junk = await ingest(views, 200, str(Path(workdir) / "batched.db"))
+        store = {
+            "commit_per_beacon": round(store_rate(views, 1, str(Path(workdir) / "store-single.db"))),
+            "batched": round(store_rate(views, 200, str(Path(workdir) / "store-batched.db"))),
+        }
+
+    summary = response.json()
+    expected = expected_summary(views)
+    if response.status_code != 200:
+        failures.append(f"summary: status {response.status_code}")
+    for route, devices in expected.items():
+        for device, metrics in devices.items():
+            for name, stats in metrics.items():
+                got = summary.get(route, {}).get(device, {}).get(name, {})
+                for key, value in stats.items():
+                    if abs(got.get(key, -1) - value) > 1e-3:
+                        failures.append(f"{route} {device} {name} {key}: {got.get(key)}, expected {value}")
+    if set(summary) - set(ROUTES) or any(set(devices) - set(USER_AGENTS) for devices in summary.values()):
+        failures.append(f"unexpected groups in summary: {json.dumps(summary)[:200]}")
+    if any(status not in (204, 413) for status in junk):
+        failures.append(f"junk beacons answered {junk}")
+
+    return {
+        "views": count,
+        "beacons": beacons,
+        "beacons_per_s": {"commit_per_beacon": round(per_beacon), "batched": round(batched)},
+        "store_rows_per_s": store,
+        "summary": summary,
+        "failures": failures,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--views", type=int, default=2000, help="simulated page views")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.views))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        rates = result["beacons_per_s"]
+        print(f"{result['views']} page views, {result['beacons']} beacons")
+        store = result["store_rows_per_s"]
+        print(f"endpoint: {rates['commit_per_beacon']} beacons/s committing each, {rates['batched']} batched")
+        print(f"store:    {store['commit_per_beacon']} rows/s committing each, {store['batched']} batched")
+        for route, devices in result["summary"].items():
+            for device, metrics in devices.items():
+                line = "  ".join(f"{name} p75={stats['p75']}" for name, stats in metrics.items())
+                print(f"{route:<5} {device:<8} {line}")
+        for failure in result["failures"]:
+            print(f"FAIL {failure}")
+    sys.exit(1 if result["failures"] else 0)
@@ -0,0 +1,107 @@
+import dataclasses
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+import psutil
+import reflex as rx
+from reflex import constants
+from reflex.config import get_config
+from reflex.utils import console, prerequisites
+from .styles import Stylesheet
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+ROOT_DIR = PACKAGE_DIR.parent
+STAMP_FILE = ".portfolio_build"
+REPORT_FILE = "startup.jsonl"
+
+
+def fingerprint(*inputs) -> str:
+    """Hash everything that feeds the compiled frontend."""
+    digest = hashlib.sha256(constants.Reflex.VERSION.encode())
+    sources = [
+        *sorted(PACKAGE_DIR.glob("*.py")),
+        ROOT_DIR / "rxconfig.py",
+        ROOT_DIR / "assets" / "projects" / "manifest.json",
+    ]
+    for path in sources:
+        if path.exists():
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+    # Env-driven settings (e.g. static export, api_url) change the output without touching rxconfig.py.
+    digest.update(json.dumps(get_config().dict(), sort_keys=True, default=str).encode())
+    for value in inputs:
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+@dataclasses.dataclass()
+class CachedApp(rx.App):
+    """An App that skips rewriting the frontend when its inputs haven't changed.
+
+    Pages are still evaluated on every start, since the backend needs them to
+    set up state; only the (much slower) frontend output is reused. Every
+    compile appends a line to .web/startup.jsonl so cold-start regressions
+    can be tracked.
+    """
+
+    # Stylesheets built in Python, written into assets/ and added to
+    # `stylesheets` when the app compiles rather than when it is imported.
+    generated_stylesheets: list[Stylesheet] = dataclasses.field(default_factory=list)
+
+    def _fingerprint(self, export: bool) -> str:
+        return fingerprint(self.style, export)
+
+    def _should_compile(self) -> bool:
+        # Decided once per compile, since Reflex's check deletes the .nocompile marker it reads.
+        decision = getattr(self, "_compile_decision", None)
+        if decision is not None:
+            return decision
+        if not super()._should_compile():
+            return False
+        web_dir = prerequisites.get_web_dir()
+        stamp = web_dir / STAMP_FILE
+        return not (
+            stamp.exists()
+            and stamp.read_text() == self._compile_fingerprint
+            and (web_dir / constants.Dirs.PAGES).exists()
+        )
+
+    def _compile(self, export: bool = False):
+        started = time.perf_counter()
+        for stylesheet in self.generated_stylesheets:
+            url = stylesheet.write()
+            if url not in self.stylesheets:
+                self.stylesheets.append(url)
+        self._compile_fingerprint = self._fingerprint(export)
+        self._compile_decision = None
+        self._compile_decision = self._should_compile()
+        cached = not self._compile_decision
+        try:
+            super()._compile(export=export)
+        finally:
+            self._compile_decision = None
+        web_dir = prerequisites.get_web_dir()
+        if not cached and web_dir.exists():
+            (web_dir / STAMP_FILE).write_text(self._compile_fingerprint)
+        self._report_startup(time.perf_counter() - started, cached)
+
+    def _report_startup(self, compile_seconds: float, cached: bool) -> None:
+        since_start = time.time() - psutil.Process().create_time()
+        report = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "pid": os.getpid(),
+            "fingerprint": self._compile_fingerprint[:12],
+            "cached": cached,
+            "compile_s": round(compile_seconds, 3),
+            "process_start_to_ready_s": round(since_start, 3),
+        }
+        console.info(
+            f"Startup: compiled in {report['compile_s']}s ({'cached' if cached else 'fresh'}), "
+            f"ready {report['process_start_to_ready_s']}s after process start"
+        )
+        web_dir = prerequisites.get_web_dir()
+        if web_dir.exists():
+            with open(web_dir / REPORT_FILE, "a") as f:
+                f.write(json.dumps(report) + "\n")
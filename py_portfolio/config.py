@@ -0,0 +1,96 @@
+import os
+import re
+import threading
+from dataclasses import dataclass, fields
+from dotenv import dotenv_values
+
+ENV_FILE = os.getenv("ENV_FILE", ".env")
+
+EMAIL_REGEX = r"[^@]+@[^@]+\.[^@]+"
+
+
+class ConfigError(Exception):
+    """Raised when the server email configuration is missing or invalid."""
+
+
+@dataclass(frozen=True)
+class Settings:
+    gmail_address: str = ""
+    gmail_app_password: str = ""
+    receiver_email: str = ""
+    smtp_host: str = "smtp.gmail.com"
+    smtp_port: int = 587
+    smtp_starttls: bool = True
+
+    def problems(self) -> list[str]:
+        """Return a description of everything wrong with these settings."""
+        problems = [
+            f"{name} is not set"
+            for name in ("GMAIL_ADDRESS", "GMAIL_APP_PASSWORD", "RECEIVER_EMAIL")
+            if not getattr(self, name.lower())
+        ]
+        for name in ("gmail_address", "receiver_email"):
+            value = getattr(self, name)
+            if value and not re.match(EMAIL_REGEX, value):
+                problems.append(f"{name.upper()} is not a valid email address")
+        return problems
+
+    def validate(self) -> "Settings":
+        """Raise ConfigError if the settings can't be used to send email."""
+        problems = self.problems()
+        if problems:
+            raise ConfigError("; ".join(problems))
+        return self
+
+
+def _parse(values: dict) -> Settings:
+    kwargs = {}
+    for field in fields(Settings):
+        value = values.get(field.name.upper())
+        if value is None:
+            continue
+        if field.type is int:
+            value = int(value)
+        elif field.type is bool:
+            value = value.strip().lower() not in ("0", "false", "no", "")
+        kwargs[field.name] = value
+    return Settings(**kwargs)
+
+
+class SettingsLoader:
+    """Loads settings from the environment and an env file into an immutable snapshot.
+
+    The env file is only re-read when its inode or mtime changes, so `get`
+    costs one stat call on the hot path. As with `load_dotenv(override=True)`,
+    values in the file take precedence over the process environment.
+    """
+
+    def __init__(self, path: str = ENV_FILE) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._stamp: tuple | None = None
+        self._settings: Settings | None = None
+
+    def _file_stamp(self) -> tuple | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def get(self) -> Settings:
+        """Return the current settings, reloading if the env file changed."""
+        stamp = self._file_stamp()
+        if self._settings is not None and stamp == self._stamp:
+            return self._settings
+        with self._lock:
+            if self._settings is None or stamp != self._stamp:
+                values = dict(os.environ)
+                if stamp is not None:
+                    values.update({k: v for k, v in dotenv_values(self.path).items() if v is not None})
+                self._settings = _parse(values)
+                self._stamp = stamp
+            return self._settings
+
+
+settings = SettingsLoader()
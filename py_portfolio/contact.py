@@ -0,0 +1,110 @@
+import re
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from . import config, delivery, metrics
+from .dedup import idempotency_key, submissions
+from .ratelimit import limiter
+
+STATUS_REQUIRED = "All fields are required!"
+STATUS_INVALID_EMAIL = "Please enter a valid email address!"
+STATUS_TOO_SHORT = "Your message is too short! Please provide more details."
+STATUS_RATE_LIMITED = "You've sent several messages recently, please wait a few minutes and try again."
+
+MIN_MESSAGE_LENGTH = 10
+
+# The rules `check` applies, as HTML constraint attributes (React spelling) for
+# each form field, so the browser rejects the same input before anything is sent.
+FIELD_CONSTRAINTS: dict[str, dict] = {
+    "name": {"required": True},
+    "email": {"required": True, "pattern": config.EMAIL_REGEX},
+    "message": {"required": True, "minLength": MIN_MESSAGE_LENGTH},
+}
+
+# Status shown in the browser for each failed constraint (ValidityState flag).
+CONSTRAINT_MESSAGES: dict[str, str] = {
+    "valueMissing": STATUS_REQUIRED,
+    "typeMismatch": STATUS_INVALID_EMAIL,
+    "patternMismatch": STATUS_INVALID_EMAIL,
+    "tooShort": STATUS_TOO_SHORT,
+}
+
+
+def check(name: str, email: str, message: str, client: str) -> str | None:
+    """Rate-limit and validate a submission, returning an error status if it is rejected."""
+    if not limiter.allow("client", client):
+        metrics.count_rejection("rate_limited_client")
+        return STATUS_RATE_LIMITED
+
+    if not name or not email or not message:
+        metrics.count_rejection("required")
+        return STATUS_REQUIRED
+
+    # Simple email validation; a full match, like the form's pattern attribute
+    if not re.fullmatch(config.EMAIL_REGEX, email):
+        metrics.count_rejection("invalid_email")
+        return STATUS_INVALID_EMAIL
+
+    # Simple message validation (e.g., too short or generic)
+    if len(message) < MIN_MESSAGE_LENGTH:
+        metrics.count_rejection("too_short")
+        return STATUS_TOO_SHORT
+
+    if not limiter.allow("sender", email.strip().lower()):
+        metrics.count_rejection("rate_limited_sender")
+        return STATUS_RATE_LIMITED
+    return None
+
+
+def send(name: str, email: str, message: str, urgent: bool = False) -> tuple[str, str | None]:
+    """Write an accepted submission to the outbox, returning the status and job id."""
+    if config.settings.get().problems():
+        return delivery.STATUS_MISCONFIGURED, None
+    submission = delivery.Submission(name=name, email=email, message=message, urgent=urgent)
+    return delivery.STATUS_QUEUED, delivery.queue.enqueue(submission)
+
+
+def submit(
+    name: str, email: str, message: str, client: str, session: str, urgent: bool = False
+) -> tuple[str, str | None]:
+    """Check and queue a submission once, returning the status and job id.
+
+    A double-click or a replayed event repeats a submission with the same
+    content from the same session. Within the dedup TTL such a repeat isn't
+    checked or queued again while the original is pending or delivered; it
+    gets the original's job id and current status. If the original failed,
+    the repeat is a retry and goes through as a new submission.
+    """
+    key = idempotency_key(session or client, name, email, message)
+    job_id = submissions.get(key)
+    if job_id is not None:
+        status = delivery.queue.status(job_id)
+        if status in (None, delivery.STATUS_SENT):
+            metrics.count_rejection("duplicate")
+            return status or delivery.STATUS_QUEUED, job_id
+        submissions.discard(key)
+
+    error = check(name, email, message, client)
+    if error:
+        return error, None
+    status, job_id = send(name, email, message, urgent)
+    if job_id is not None:
+        submissions.put(key, job_id)
+    return status, job_id
+
+
+async def contact_endpoint(request: Request) -> JSONResponse:
+    """Accept a submission from the static contact-form island."""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    name, email, message = (str(data.get(key, "")) for key in ("name", "email", "message"))
+    client = request.client.host if request.client else ""
+
+    # The island sends an id it picks once per page load.
+    urgent = bool(data.get("urgent"))
+    status, job_id = submit(name, email, message, client, str(data.get("session", "")), urgent)
+    ok = status in (delivery.STATUS_QUEUED, delivery.STATUS_SENT)
+    return JSONResponse({"ok": ok, "status": status})
@@ -0,0 +1,75 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from reflex.config import get_config
+
+# Used when rxconfig.py doesn't set `dedup`.
+DEFAULT_DEDUP: dict = {"ttl": 10 * 60, "max_tracked": 10_000}
+
+
+def idempotency_key(session: str, *fields: str) -> str:
+    """Key a submission by its session and content, ignoring case and runs of whitespace."""
+    digest = hashlib.sha256(session.encode())
+    for field in fields:
+        digest.update(b"\0" + " ".join(field.split()).lower().encode())
+    return digest.hexdigest()
+
+
+class DedupCache:
+    """Results of recent submissions by idempotency key, in a bounded LRU.
+
+    Entries expire `ttl` seconds after they were stored. Once more than
+    `max_tracked` keys are held the oldest is dropped, so a flood of
+    distinct submissions only shortens how long repeats are recognised.
+    """
+
+    def __init__(self, settings: dict | None = None) -> None:
+        self._settings: dict | None = None
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        if settings is not None:
+            self.configure(settings)
+
+    @property
+    def settings(self) -> dict:
+        if self._settings is None:
+            self.configure(getattr(get_config(), "dedup", None) or {})
+        return self._settings
+
+    def configure(self, settings: dict) -> None:
+        """Apply `settings` over DEFAULT_DEDUP and forget every stored result."""
+        with self._lock:
+            self._settings = {**DEFAULT_DEDUP, **settings}
+            self._entries.clear()
+
+    def get(self, key: str):
+        """Return the value stored for `key`, or None if there is none or it expired."""
+        now = time.monotonic()
+        with self._lock:
+            # Entries are kept in the order they were stored, so the expired ones are in front.
+            while self._entries:
+                oldest, (_, expires) = next(iter(self._entries.items()))
+                if expires > now:
+                    break
+                del self._entries[oldest]
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def put(self, key: str, value) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, time.monotonic() + self.settings["ttl"])
+            while len(self._entries) > self.settings["max_tracked"]:
+                self._entries.popitem(last=False)
+
+
+submissions = DedupCache()
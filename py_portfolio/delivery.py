@@ -0,0 +1,378 @@
+import asyncio
+import contextlib
+import html
+import smtplib
+import threading
+import time
+from dataclasses import dataclass
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from reflex.config import get_config
+from reflex.utils import console
+from . import metrics
+from .config import ConfigError, Settings, settings
+from .outbox import Outbox
+from .smtp_pool import SMTPPool
+
+STATUS_QUEUED = "Your message has been queued and will be sent shortly."
+STATUS_SENT = "Your message has been sent successfully!"
+STATUS_MISCONFIGURED = "Missing server email configuration, could not submit your message."
+
+# Used when rxconfig.py doesn't set `digest`. A window of 0 sends every
+# submission on its own.
+DEFAULT_DIGEST: dict = {"window": 0, "max_size": 20}
+
+
+@dataclass(frozen=True)
+class Submission:
+    name: str
+    email: str
+    message: str
+    urgent: bool = False
+
+
+def _header(value: str) -> str:
+    # Keep visitor input on one line so it can't add headers.
+    return " ".join(value.split())
+
+
+def _text(submission: Submission) -> str:
+    return f"Name: {submission.name}\nEmail: {submission.email}\nMessage:\n{submission.message}\n"
+
+
+def _html(submission: Submission) -> str:
+    name, email, message = (html.escape(value) for value in (submission.name, submission.email, submission.message))
+    message = message.replace("\n", "<br>\n")
+    return f"<p><b>Name:</b> {name}<br>\n<b>Email:</b> {email}<br>\n<b>Message:</b><br>\n{message}</p>\n"
+
+
+def _email(subject: str, text: str, body: str, sender_email: str, receiver_email: str) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg['From'] = sender_email
+    msg['To'] = receiver_email
+    msg['Subject'] = subject
+    msg.attach(MIMEText(text, 'plain', 'utf-8'))
+    msg.attach(MIMEText(f"<html><body>\n{body}</body></html>\n", 'html', 'utf-8'))
+    return msg
+
+
+def build_message(submission: Submission, sender_email: str, receiver_email: str) -> MIMEMultipart:
+    """Build the notification email for a submission, as plain text and HTML."""
+    return _email(
+        f"New Contact Form Submission from {_header(submission.name)}",
+        _text(submission),
+        _html(submission),
+        sender_email,
+        receiver_email,
+    )
+
+
+def build_digest(submissions: list[Submission], sender_email: str, receiver_email: str) -> MIMEMultipart:
+    """Build one notification email for several submissions."""
+    count = len(submissions)
+    return _email(
+        f"{count} New Contact Form Submission{'s' if count != 1 else ''}",
+        "\n".join(f"--- {i} of {count} ---\n{_text(submission)}" for i, submission in enumerate(submissions, 1)),
+        "<hr>\n".join(f"<h3>{i} of {count}</h3>\n{_html(submission)}" for i, submission in enumerate(submissions, 1)),
+        sender_email,
+        receiver_email,
+    )
+
+
+_pool: SMTPPool | None = None
+_pool_lock = threading.Lock()
+
+
+_pool_settings: Settings | None = None
+
+
+def get_pool(current: Settings, timeout: float = 10.0) -> SMTPPool:
+    """Return the shared SMTP pool, replacing it if the settings changed."""
+    global _pool, _pool_settings
+    with _pool_lock:
+        if _pool is None or _pool_settings != current:
+            if _pool is not None:
+                _pool.close()
+            _pool = SMTPPool(
+                current.smtp_host,
+                current.smtp_port,
+                username=current.gmail_address,
+                password=current.gmail_app_password,
+                starttls=current.smtp_starttls,
+                timeout=timeout,
+            )
+            _pool_settings = current
+        return _pool
+
+
+def _pool_metrics() -> list[str]:
+    stats = _pool.stats() if _pool is not None else {}
+    idle = stats.pop("idle", 0)
+    lines = [
+        "# HELP portfolio_smtp_pool_events_total SMTP pool session events (connects vs. reuses).",
+        "# TYPE portfolio_smtp_pool_events_total counter",
+    ]
+    lines += [f'portfolio_smtp_pool_events_total{{event="{key}"}} {value}' for key, value in stats.items()]
+    lines += [
+        "# HELP portfolio_smtp_pool_idle_sessions Authenticated SMTP sessions waiting for reuse.",
+        "# TYPE portfolio_smtp_pool_idle_sessions gauge",
+        f"portfolio_smtp_pool_idle_sessions {idle}",
+    ]
+    return lines
+
+
+metrics.registry.collectors.append(_pool_metrics)
+
+
+def send_submission(submission: Submission, timeout: float = 10.0) -> None:
+    """Send a submission using Gmail SMTP. Blocking, run it off the event loop."""
+    current = settings.get().validate()
+    msg = build_message(submission, current.gmail_address, current.receiver_email)
+    get_pool(current, timeout).send_message(msg)
+
+
+def send_digest(submissions: list[Submission], timeout: float = 10.0) -> None:
+    """Send several submissions as one email. Blocking, run it off the event loop."""
+    current = settings.get().validate()
+    msg = build_digest(submissions, current.gmail_address, current.receiver_email)
+    get_pool(current, timeout).send_message(msg)
+
+
+class DeliveryQueue:
+    """Delivers submissions from the outbox with a bounded pool of workers.
+
+    `enqueue` is a single local insert. Workers claim due rows in batches,
+    send each with a timeout and mark the batch delivered; failed rows are
+    retried with exponential backoff. Rows left over from a restart or an
+    SMTP outage are picked up when the pool starts with the backend (see
+    `lifespan`) and on every poll after. The final status of a submission is
+    handed back through `wait`. When several backend processes share the
+    outbox, another one may deliver it, so `wait` then also polls the outbox,
+    backing off from `status_poll` to `max_status_poll` seconds; `status`
+    reads it from there.
+
+    In digest mode (a `window` in the `digest` settings) submissions that
+    aren't urgent are held until the oldest has waited `window` seconds or
+    `max_size` of them are waiting, then sent together in one email.
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox | None = None,
+        send=send_submission,
+        workers: int = 2,
+        batch_size: int = 10,
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff: float = 1.0,
+        poll_interval: float = 30.0,
+        status_poll: float = 1.0,
+        max_status_poll: float = 30.0,
+        shared: bool | None = None,
+        send_digest=send_digest,
+        digest: dict | None = None,
+    ) -> None:
+        self._outbox = outbox
+        self.send = send
+        self.send_digest = send_digest
+        self._digest = digest
+        self.workers = workers
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.status_poll = status_poll
+        self.max_status_poll = max_status_poll
+        self._shared = shared
+        self._wakeup: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._results: dict[str, asyncio.Future] = {}
+
+    @property
+    def outbox(self) -> Outbox:
+        if self._outbox is None:
+            self._outbox = Outbox()
+        return self._outbox
+
+    @property
+    def shared(self) -> bool:
+        """Whether other backend processes may deliver from the same outbox."""
+        if self._shared is None:
+            config = get_config()
+            self._shared = bool(config.redis_url) or (config.gunicorn_workers or 1) > 1
+        return self._shared
+
+    @property
+    def digest(self) -> dict:
+        if self._digest is None:
+            self._digest = {**DEFAULT_DIGEST, **(getattr(get_config(), "digest", None) or {})}
+        return self._digest
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop if it is not already up."""
+        if self._tasks and not all(task.done() for task in self._tasks):
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        """Cancel the worker pool."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(self, submission: Submission) -> str:
+        """Persist a submission to the outbox and return its job id."""
+        self.start()
+        job_id = str(self.outbox.add(submission.name, submission.email, submission.message, submission.urgent))
+        self._wakeup.set()
+        return job_id
+
+    async def wait(self, job_id: str) -> str:
+        """Wait for a queued submission to finish and return its final status."""
+        # Only waiters get a future, so jobs nobody waits for (e.g. from the island) leave nothing behind.
+        future = self._results.get(job_id)
+        if future is None:
+            if self.outbox.status(int(job_id)) is None:
+                return STATUS_QUEUED
+            status = self.status(job_id)
+            if status is not None:
+                return status
+            future = self._results[job_id] = asyncio.get_running_loop().create_future()
+        try:
+            if not self.shared:
+                return await future
+            interval = self.status_poll
+            while True:
+                try:
+                    return await asyncio.wait_for(asyncio.shield(future), interval)
+                except asyncio.TimeoutError:
+                    status = self.status(job_id)
+                    if status is not None:
+                        return status
+                    interval = min(interval * 2, self.max_status_poll)
+        finally:
+            self._results.pop(job_id, None)
+
+    def status(self, job_id: str) -> str | None:
+        """The final status of a job from the outbox, or None while it is still pending."""
+        row = self.outbox.status(int(job_id))
+        if row is None:
+            return None
+        state, error = row
+        if state == "delivered":
+            return STATUS_SENT
+        if state == "failed":
+            return f"Failed to send your message: {error or 'unknown error'}"
+        return None
+
+    def _resolve(self, job_id: str, status: str) -> None:
+        future = self._results.get(job_id)
+        if future is not None and not future.done():
+            future.set_result(status)
+
+    async def _idle(self) -> None:
+        self.outbox.release_stale()
+        self.outbox.purge_delivered()
+        timeout = self.poll_interval
+        due = self.outbox.next_due(self.digest["window"])
+        if due is not None:
+            timeout = min(timeout, max(due - time.time(), 0.05))
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _digest_due(self) -> bool:
+        count, oldest = self.outbox.digest_backlog()
+        return count >= self.digest["max_size"] or (oldest is not None and oldest <= time.time() - self.digest["window"])
+
+    async def _worker(self) -> None:
+        errors = 0
+        while True:
+            try:
+                await self._work()
+                errors = 0
+            except Exception as e:
+                # E.g. "database is locked" while another process holds the
+                # outbox. Rows claimed so far go back once their lease expires.
+                errors += 1
+                delay = min(self.backoff * 2 ** (errors - 1), self.poll_interval)
+                console.error(f"Contact-form delivery worker failed, retrying in {delay:.1f}s: {e!r}")
+                await asyncio.sleep(delay)
+
+    async def _work(self) -> None:
+        """Deliver one claimed batch, or wait for work if there is none."""
+        self._wakeup.clear()
+        if not self.digest["window"]:
+            batch = self.outbox.claim(self.batch_size)
+        else:
+            batch = self.outbox.claim(self.batch_size, urgent=True)
+            if not batch and self._digest_due():
+                rows = self.outbox.claim(self.digest["max_size"], urgent=False)
+                if rows:
+                    await self._send_digest(rows)
+                    return
+        if not batch:
+            await self._idle()
+            return
+        delivered = []
+        for row_id, name, email, message, attempts in batch:
+            error = await self._deliver(self.send, Submission(name=name, email=email, message=message))
+            if error is None:
+                delivered.append(row_id)
+                self._resolve(str(row_id), STATUS_SENT)
+            else:
+                self._failed(row_id, attempts, error)
+        self.outbox.mark_delivered(delivered)
+
+    async def _send_digest(self, rows: list[tuple]) -> None:
+        submissions = [Submission(name=name, email=email, message=message) for _, name, email, message, _ in rows]
+        error = await self._deliver(self.send_digest, submissions)
+        if error is None:
+            self.outbox.mark_delivered([row[0] for row in rows])
+            for row in rows:
+                self._resolve(str(row[0]), STATUS_SENT)
+            return
+        for row_id, _, _, _, attempts in rows:
+            self._failed(row_id, attempts, error)
+
+    def _failed(self, row_id: int, attempts: int, error: Exception) -> None:
+        if isinstance(error, ConfigError):
+            self.outbox.fail(row_id, str(error))
+            self._resolve(str(row_id), STATUS_MISCONFIGURED)
+        elif isinstance(error, smtplib.SMTPAuthenticationError) or attempts + 1 >= self.retries:
+            # Retrying won't fix bad credentials.
+            self.outbox.fail(row_id, str(error))
+            self._resolve(str(row_id), f"Failed to send your message: {str(error) or type(error).__name__}")
+        else:
+            self.outbox.retry(row_id, str(error), self.backoff * 2 ** attempts)
+
+    async def _deliver(self, send, payload) -> Exception | None:
+        # The pool's sockets time out the connect and every read and write, so
+        # the send ends on its own. Cancelling the wait instead would leave the
+        # thread sending while the job is retried, and the email could go twice.
+        try:
+            await asyncio.to_thread(send, payload, self.timeout)
+        except Exception as e:
+            return e
+        return None
+
+queue = DeliveryQueue()
+
+
+@contextlib.asynccontextmanager
+async def lifespan():
+    """Run the worker pool for the life of the backend, so a backlog left by a restart drains on boot."""
+    if settings.get().problems():
+        # Workers would fail every pending row; they start with the first submission once configured.
+        console.warn("Contact form not configured, leaving the outbox as it is.")
+        yield
+        return
+    queue.start()
+    try:
+        yield
+    finally:
+        await queue.stop()
@@ -0,0 +1,126 @@
+"""Build-time image pipeline for the project cards.
+
+    python -m py_portfolio.images
+
+Each project image source (URL or local path) is resized to a few widths in
+AVIF and WebP under assets/projects/. Results are keyed by a hash of the
+source bytes in assets/projects/manifest.json, so unchanged images are not
+reprocessed. Building needs Pillow; serving only reads the manifest.
+"""
+import hashlib
+import json
+import sys
+import urllib.request
+from io import BytesIO
+from pathlib import Path
+import reflex as rx
+
+OUTPUT_DIR = Path(__file__).resolve().parents[1] / "assets" / "projects"
+URL_PREFIX = "/projects"
+WIDTHS = (300, 600, 900)
+# Preferred format first; the last one is used for the <img> fallback.
+FORMATS = {"avif": "image/avif", "webp": "image/webp"}
+SIZES = "300px"
+
+
+def load_manifest(output_dir: Path = OUTPUT_DIR) -> dict:
+    """Return the manifest of built images, or an empty one if nothing was built."""
+    try:
+        return json.loads((output_dir / "manifest.json").read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def read_source(source: str) -> bytes:
+    if source.startswith(("http://", "https://")):
+        request = urllib.request.Request(source, headers={"User-Agent": "py-portfolio-images"})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.read()
+    return Path(source).read_bytes()
+
+
+def build_image(data: bytes, digest: str, output_dir: Path, widths=WIDTHS) -> dict:
+    """Write the resized variants of one image and return its manifest entry."""
+    try:
+        from PIL import Image, ImageOps, features
+    except ImportError:
+        raise RuntimeError("Building images requires Pillow: pip install pillow") from None
+
+    with Image.open(BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        # Never upscale; small sources just get fewer variants.
+        sizes = sorted({min(width, image.width) for width in widths})
+        entry = {"hash": digest, "variants": {}}
+        for fmt in FORMATS:
+            if not features.check(fmt):
+                print(f"Pillow was built without {fmt} support, skipping it", file=sys.stderr)
+                continue
+            for width in sizes:
+                height = round(image.height * width / image.width)
+                name = f"{digest}-{width}.{fmt}"
+                image.resize((width, height), Image.LANCZOS).save(output_dir / name, fmt.upper(), quality=70)
+                entry["variants"].setdefault(fmt, []).append([width, f"{URL_PREFIX}/{name}"])
+        entry["width"] = sizes[-1]
+        entry["height"] = round(image.height * sizes[-1] / image.width)
+    return entry
+
+
+def build(sources: list[str], output_dir: Path = OUTPUT_DIR, widths=WIDTHS) -> dict:
+    """Build variants for every source, reusing cached results whose content hash still matches."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cached = load_manifest(output_dir)
+    manifest = {}
+    for source in sources:
+        data = read_source(source)
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        entry = cached.get(source)
+        if entry and entry["hash"] == digest and all(
+            (output_dir / Path(url).name).exists()
+            for variants in entry["variants"].values()
+            for _, url in variants
+        ):
+            manifest[source] = entry
+            continue
+        manifest[source] = build_image(data, digest, output_dir, widths)
+
+    # Drop variants that no source refers to any more.
+    keep = {Path(url).name for entry in manifest.values() for variants in entry["variants"].values() for _, url in variants}
+    for path in output_dir.iterdir():
+        if path.name != "manifest.json" and path.name not in keep:
+            path.unlink()
+    (output_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def project_image(source: str, alt: str, manifest: dict | None = None, **props) -> rx.Component:
+    """A lazy, sized <picture> for a built image, or the original source if it hasn't been built."""
+    entry = (load_manifest() if manifest is None else manifest).get(source)
+    if not entry or not entry["variants"]:
+        return rx.image(src=source, alt=alt, loading="lazy", decoding="async", **props)
+
+    srcsets = {
+        fmt: ", ".join(f"{url} {width}w" for width, url in variants)
+        for fmt, variants in entry["variants"].items()
+    }
+    *preferred, fallback = [fmt for fmt in FORMATS if fmt in srcsets]
+    return rx.el.picture(
+        *[rx.el.source(type=FORMATS[fmt], src_set=srcsets[fmt], sizes=SIZES) for fmt in preferred],
+        rx.image(
+            src=entry["variants"][fallback][0][1],
+            src_set=srcsets[fallback],
+            sizes=SIZES,
+            alt=alt,
+            loading="lazy",
+            decoding="async",
+            custom_attrs={"width": entry["width"], "height": entry["height"]},
+            **props,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    from .projects import PROJECTS
+
+    for source, entry in build([project["image"] for project in PROJECTS]).items():
+        print(f"{entry['hash']}  {sum(len(v) for v in entry['variants'].values())} variants  {source}")
@@ -0,0 +1,125 @@
+from typing import Any
+from reflex.compiler import compiler
+from reflex.components.component import Component, StatefulComponent
+from reflex.utils import imports, prerequisites
+from reflex.utils.imports import ImportVar
+from reflex.vars.base import Var
+
+# Compiled section modules, under .web.
+MODULE_DIR = ("components", "lazy")
+
+# Sections created by the last evaluation of the pages, by name.
+sections: dict[str, Component] = {}
+
+LAZY_SECTION_JS = """
+function LazySection({ section: Section, minHeight, marginTop, rootMargin }) {
+    const ref = useRef(null);
+    const [near, setNear] = useState(false);
+    useEffect(() => {
+        if (near) return;
+        if (!("IntersectionObserver" in window)) {
+            setNear(true);
+            return;
+        }
+        const observer = new IntersectionObserver((entries) => {
+            if (entries.some((entry) => entry.isIntersecting)) setNear(true);
+        }, { rootMargin });
+        observer.observe(ref.current);
+        return () => observer.disconnect();
+    }, [near, rootMargin]);
+    return near ? <Section /> : <div ref={ref} style={{ minHeight, marginTop }} />;
+}
+"""
+
+
+class LazySection(Component):
+    """Placeholder for a section whose code is only loaded when it nears the viewport.
+
+    The section is compiled into its own module and imported with
+    next/dynamic, so its components, hooks and state bindings are neither
+    in the page's first-load JavaScript nor hydrated with the page. Until
+    then a box of `min_height` (plus the section's `margin_top`) holds its
+    place, so the page doesn't jump when it arrives.
+    """
+
+    tag = "LazySection"
+
+    # The dynamically imported section component.
+    section: Var[Any]
+
+    min_height: Var[str]
+
+    margin_top: Var[str]
+
+    # How far outside the viewport loading starts.
+    root_margin: Var[str]
+
+    def add_imports(self) -> imports.ImportDict:
+        return {
+            "react": ["useEffect", "useRef", "useState"],
+            "next/dynamic": ImportVar(tag="dynamic", is_default=True),
+        }
+
+    def add_custom_code(self) -> list[str]:
+        return [LAZY_SECTION_JS]
+
+    def _get_dynamic_imports(self) -> str:
+        section = self.section._js_expr
+        name = section.removeprefix("Lazy_")
+        placeholder = (
+            f"<div style={{{{ minHeight: {self.min_height._js_expr}, marginTop: {self.margin_top._js_expr} }}}} />"
+        )
+        return (
+            f"const {section} = dynamic(() => import('$/{'/'.join(MODULE_DIR)}/{name}'), "
+            f"{{ ssr: false, loading: () => {placeholder} }});"
+        )
+
+
+def lazy_section(
+    name: str, component: Component, min_height: str, margin_top: str = "0", root_margin: str = "600px"
+) -> Component:
+    """Render `component` only once it is within `root_margin` of the viewport."""
+    sections[name] = component
+    return LazySection.create(
+        section=Var(_js_expr=f"Lazy_{name}", _var_type=Any),
+        min_height=min_height,
+        margin_top=margin_top,
+        root_margin=root_margin,
+    )
+
+
+def compile_section(component: Component, state, style: dict | None, theme) -> str:
+    """Compile a section into a module whose default export renders it, like a page."""
+    component._add_style_recursive(style or {}, theme)
+    component = StatefulComponent.compile_from(component) or component
+    return compiler.compile_page("", component, state)[1]
+
+
+class LazySections:
+    """App mixin that writes the lazy sections' modules with the rest of the frontend.
+
+    The sections aren't part of any page tree, so their styles, packages and
+    app wrappers are added here the way Reflex does for pages.
+    """
+
+    def _app_root(self, app_wrappers: dict) -> Component:
+        for component in sections.values():
+            app_wrappers.update(component._get_all_app_wrap_components())
+        return super()._app_root(app_wrappers)
+
+    def _get_frontend_packages(self, page_imports: dict) -> None:
+        # Called once the pages are compiled and only then, so write the sections alongside.
+        module_dir = prerequisites.get_web_dir().joinpath(*MODULE_DIR)
+        module_dir.mkdir(parents=True, exist_ok=True)
+        written = set()
+        for name, component in sections.items():
+            code = compile_section(component, self.state, self.style, self.theme)
+            path = module_dir / f"{name}.js"
+            if not path.exists() or path.read_text() != code:
+                path.write_text(code)
+            written.add(path)
+            page_imports = imports.merge_imports(page_imports, component._get_all_imports())
+        for path in module_dir.glob("*.js"):
+            if path not in written:
+                path.unlink()
+        super()._get_frontend_packages(page_imports)
@@ -0,0 +1,165 @@
+import asyncio
+import bisect
+import contextlib
+import functools
+import inspect
+import threading
+import time
+from reflex.config import get_config
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+# Set `metrics=False` in rxconfig.py (or PORTFOLIO_METRICS=0) to compile all
+# instrumentation out: `timed` returns the function untouched and `timer`
+# becomes a no-op context manager.
+ENABLED: bool = getattr(get_config(), "metrics", True)
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{str(value)}"' for key, value in sorted(labels.items()))
+    return "{" + pairs + "}"
+
+
+class Counter:
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(dict(key))} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple = BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        # label key -> [bucket counts..., sum, count]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._values.items()):
+                labels = dict(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+                lines.append(f"{self.name}_bucket{_labels({**labels, 'le': '+Inf'})} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(labels)} {series[-2]}")
+                lines.append(f"{self.name}_count{_labels(labels)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: list = []
+        # Callables returning extra exposition lines, for values read at scrape time.
+        self.collectors: list = []
+
+    def counter(self, name: str, help: str) -> Counter:
+        metric = Counter(name, help)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, buckets: tuple = BUCKETS) -> Histogram:
+        metric = Histogram(name, help, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+event_handler_seconds = registry.histogram("portfolio_event_handler_seconds", "Time spent in State event handlers.")
+event_handler_errors = registry.counter("portfolio_event_handler_errors_total", "State event handlers that raised.")
+submissions_rejected = registry.counter("portfolio_submissions_rejected_total", "Contact submissions rejected before delivery, by reason.")
+smtp_seconds = registry.histogram("portfolio_smtp_seconds", "SMTP connect, starttls, login and send latency.")
+smtp_errors = registry.counter("portfolio_smtp_errors_total", "Failed SMTP operations.")
+
+
+@contextlib.contextmanager
+def _timer(histogram: Histogram, errors: Counter, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        errors.inc(**labels)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - started, **labels)
+
+
+def timer(histogram: Histogram, errors: Counter, **labels):
+    """Time a block into `histogram`, counting exceptions in `errors`."""
+    if not ENABLED:
+        return contextlib.nullcontext()
+    return _timer(histogram, errors, **labels)
+
+
+def timed(fn):
+    """Record the latency of an event handler, keeping it sync or async like the original."""
+    if not ENABLED:
+        return fn
+    handler = fn.__name__
+
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with _timer(event_handler_seconds, event_handler_errors, handler=handler):
+                return await fn(*args, **kwargs)
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _timer(event_handler_seconds, event_handler_errors, handler=handler):
+                return fn(*args, **kwargs)
+    # Reflex maps event payloads onto handler arguments with getfullargspec,
+    # which ignores __wrapped__ but honours __signature__.
+    wrapper.__signature__ = inspect.signature(fn)
+    return wrapper
+
+
+def count_rejection(reason: str) -> None:
+    if ENABLED:
+        submissions_rejected.inc(reason=reason)
+
+
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Prometheus text exposition of every registered metric."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
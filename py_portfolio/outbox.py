@@ -0,0 +1,176 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", "outbox.db")
+
+# A claim older than this is assumed to belong to a worker that died mid-send.
+CLAIM_LEASE = 300.0
+
+# Delivered rows are deleted after this long; failed ones are kept to look into.
+DELIVERED_RETENTION = float(os.getenv("OUTBOX_RETENTION_DAYS", "7")) * 86400
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    message TEXT NOT NULL,
+    urgent INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    claim TEXT,
+    claimed_at REAL,
+    last_error TEXT,
+    created REAL NOT NULL,
+    delivered REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (state, next_attempt);
+"""
+
+
+class Outbox:
+    """Durable write-ahead store for contact submissions.
+
+    Rows move from `pending` to `sending` when a worker claims them, then to
+    `delivered` or `failed`. Claims are leased, so rows held by a worker that
+    died are picked up again by the next `release_stale`. Delivered rows are
+    removed by `purge_delivered` once past their retention.
+    """
+
+    def __init__(self, path: str = OUTBOX_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(outbox)")}
+        if "urgent" not in columns:
+            # Outboxes created before digest delivery.
+            self._db.execute("ALTER TABLE outbox ADD COLUMN urgent INTEGER NOT NULL DEFAULT 0")
+
+    def add(self, name: str, email: str, message: str, urgent: bool = False) -> int:
+        """Persist a submission and return its row id."""
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO outbox (name, email, message, urgent, created) VALUES (?, ?, ?, ?, ?)",
+                (name, email, message, urgent, time.time()),
+            )
+            return cursor.lastrowid
+
+    def claim(self, limit: int, urgent: bool | None = None) -> list[tuple]:
+        """Claim up to `limit` due rows, returning (id, name, email, message, attempts).
+
+        With `urgent` given, only rows with that urgency are claimed.
+        """
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                """
+                UPDATE outbox SET state = 'sending', claim = ?, claimed_at = ?
+                WHERE id IN (
+                    SELECT id FROM outbox
+                    WHERE state = 'pending' AND next_attempt <= ? AND (? IS NULL OR urgent = ?)
+                    ORDER BY id LIMIT ?
+                )
+                """,
+                (token, now, now, urgent, urgent, limit),
+            )
+            return self._db.execute(
+                "SELECT id, name, email, message, attempts FROM outbox WHERE claim = ? AND state = 'sending' ORDER BY id",
+                (token,),
+            ).fetchall()
+
+    def mark_delivered(self, ids: list[int]) -> None:
+        """Mark a batch of rows delivered in one transaction."""
+        if not ids:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "UPDATE outbox SET state = 'delivered', delivered = ?, claim = NULL WHERE id = ?",
+                [(now, row_id) for row_id in ids],
+            )
+            self._db.execute("COMMIT")
+
+    def retry(self, row_id: int, error: str, delay: float) -> None:
+        """Return a row to the queue, due again after `delay` seconds."""
+        with self._lock:
+            self._db.execute(
+                """
+                UPDATE outbox SET state = 'pending', attempts = attempts + 1,
+                    next_attempt = ?, last_error = ?, claim = NULL
+                WHERE id = ?
+                """,
+                (time.time() + delay, error, row_id),
+            )
+
+    def fail(self, row_id: int, error: str) -> None:
+        """Give up on a row."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET state = 'failed', attempts = attempts + 1, last_error = ?, claim = NULL WHERE id = ?",
+                (error, row_id),
+            )
+
+    def release_stale(self, lease: float = CLAIM_LEASE) -> int:
+        """Return rows whose claim has expired to the pending state."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE outbox SET state = 'pending', claim = NULL WHERE state = 'sending' AND claimed_at < ?",
+                (time.time() - lease,),
+            )
+            return cursor.rowcount
+
+    def purge_delivered(self, retention: float = DELIVERED_RETENTION) -> int:
+        """Delete rows delivered more than `retention` seconds ago."""
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM outbox WHERE state = 'delivered' AND delivered < ?",
+                (time.time() - retention,),
+            )
+            return cursor.rowcount
+
+    def next_due(self, digest_window: float = 0.0) -> float | None:
+        """Return the time the next pending row becomes due, if any.
+
+        With a digest window, rows that aren't urgent only become due once
+        they have waited that long.
+        """
+        with self._lock:
+            row = self._db.execute(
+                """
+                SELECT MIN(CASE WHEN urgent OR ? <= 0 THEN next_attempt ELSE MAX(next_attempt, created + ?) END)
+                FROM outbox WHERE state = 'pending'
+                """,
+                (digest_window, digest_window),
+            ).fetchone()
+        return row[0]
+
+    def digest_backlog(self) -> tuple[int, float | None]:
+        """Return the number of due rows that aren't urgent and when the oldest was added."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*), MIN(created) FROM outbox WHERE state = 'pending' AND NOT urgent AND next_attempt <= ?",
+                (time.time(),),
+            ).fetchone()
+
+    def status(self, row_id: int) -> tuple[str, str | None] | None:
+        """Return the (state, last_error) of a row, or None if there is no such row."""
+        with self._lock:
+            return self._db.execute("SELECT state, last_error FROM outbox WHERE id = ?", (row_id,)).fetchone()
+
+    def counts(self) -> dict:
+        """Return the number of rows in each state."""
+        with self._lock:
+            return dict(self._db.execute("SELECT state, COUNT(*) FROM outbox GROUP BY state").fetchall())
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,19 @@
+# Project cards shown on the landing page. `image` is the source the image
+# pipeline (python -m py_portfolio.images) builds local variants from.
+PROJECTS: list[dict] = [
+    {
+        "title": "AWS Security Architecture",
+        "description": "Implemented a multi-layer security architecture for a large-scale AWS deployment.",
+        "image": "https://media.licdn.com/dms/image/D4D12AQG49qCkkRk6aw/article-cover_image-shrink_720_1280/0/1691813758023?e=2147483647&v=beta&t=P-f10sxwCtfIc0lWnyFTf9z_7Z14jtsT8K2XcXx1DxQ",  # Replace with actual image URL
+    },
+    {
+        "title": "Automated Firewall Policy Checks",
+        "description": "Developed automated security compliance checks using ServiceNow API, Lambda and various other aws services.",
+        "image": "https://www.eqs.com/assets/2021/03/EQS-Blog_Compliance-Management.jpg",  # Replace with actual image URL
+    },
+    {
+        "title": "Cyberark PAM Implementation",
+        "description": "Designed and deployed a secure CyberArk PAM environment. This was fully automated within AWS.",
+        "image": "https://mms.businesswire.com/media/20241113416461/en/1950794/23/CyberArk_Logo_November_2023.jpg",  # Replace with actual image URL
+    },
+]
@@ -1,95 +1,77 @@
+import json
 import reflex as rx
-import re
+from reflex.config import get_config
 from reflex.style import set_color_mode, color_mode
-import smtplib
-import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from dotenv import load_dotenv
-
-load_dotenv()
+from reflex.utils import console
+from . import config, contact, delivery, metrics, ratelimit, vitals
+from .build_cache import CachedApp
+from .images import project_image
+from .lazy import LazySections, lazy_section
+from .styles import Stylesheet
+from .projects import PROJECTS
+from .sessions import CompactSessions
+from .static_site import StaticSite
+from .workers import SharedState
+
+# Prerender `/` without any server state; only the contact-form island talks to the backend.
+STATIC_EXPORT: bool = getattr(get_config(), "static_export", False)
+STATIC_SITE: str | None = getattr(get_config(), "static_site", None)
+VITALS: bool = getattr(get_config(), "vitals", False)
+LAZY_SECTIONS: bool = getattr(get_config(), "lazy_sections", False)
+# "compositor" (default) or "classic", see ANIMATIONS below.
+ANIMATION_MODE: str = getattr(get_config(), "animations", "compositor")
+
+for problem in config.settings.get().problems():
+    console.warn(f"Contact form disabled: {problem}")
+
+# Reject invalid rate_limits at startup rather than on the first request.
+ratelimit.limiter.limits
+
+SCROLL_TO_TOP_JS = "window.scrollTo({top: 0, behavior: 'smooth'})"
+
+CONTACT_FIELD_IDS = ("contact_name", "contact_email", "contact_message")
+CONTACT_URGENT_ID = "contact_urgent"
 
 class State(rx.State):
-    name: str = ""
-    email: str = ""
-    message: str = ""
     status: str = ""
-    is_dark_mode: bool = True
-
-    def toggle_theme(self):
-        """Toggle between light and dark themes."""
-        self.is_dark_mode = not self.is_dark_mode
 
+    @metrics.timed
     def on_mount(self):
         self.status = ""
-        self.reset_form()
-
-    def send_email(self):
-        """Send an email using Gmail SMTP."""
-        try:
-            load_dotenv(override=True)
-            # Get credentials from environment variables
-            smtp_password = os.getenv("GMAIL_APP_PASSWORD")
-            sender_email = os.getenv("GMAIL_ADDRESS")
-            receiver_email = os.getenv("RECEIVER_EMAIL")
-
-            if not all([smtp_password, sender_email, receiver_email]):
-                self.status = "Missing server email configuration, could not submit your message."
-
-            # Create the email message
-            msg = MIMEMultipart()
-            msg['From'] = sender_email
-            msg['To'] = receiver_email
-            msg['Subject'] = f"New Contact Form Submission from {self.name}"
-
-            body = f"""
-            <b>Name:</b> {self.name}<br>
-            <b>Email:</b> {self.email}<br>
-            <b>Message:</b> {self.message}
-            """
-            msg.attach(MIMEText(body, 'html'))
-
-            # Connect to Gmail SMTP server
-            with smtplib.SMTP('smtp.gmail.com', 587) as server:
-                server.starttls()
-                server.login(sender_email, smtp_password)
-                server.send_message(msg)
-            
-            self.status = "Your message has been sent successfully!"
-            self.reset_form()
-        except Exception as e:
-            self.status = f"Failed to send your message: {str(e)}"
-            self.reset_form()
-    
-    def reset_form(self):
-        """Reset the form fields and status."""
-        self.name = ""
-        self.email = ""
-        self.message = ""
 
-    def handle_submit(self):
-        """Handle form submission with basic validation."""
+    @rx.event(background=True)
+    @metrics.timed
+    async def wait_for_delivery(self, job_id: str):
+        """Push the final delivery status back to the client."""
+        status = await delivery.queue.wait(job_id)
+        async with self:
+            self.status = status
 
-        if not self.name or not self.email or not self.message:
-            self.status = "All fields are required!"
-            return
-        
-        # Simple email validation
-        email_regex = r"[^@]+@[^@]+\.[^@]+"
-        if not re.match(email_regex, self.email):
-            self.status = "Please enter a valid email address!"
-            return
-        
-        # Simple message validation (e.g., too short or generic)
-        if len(self.message) < 10:
-            self.status = "Your message is too short! Please provide more details."
+    @metrics.timed
+    def reset_form(self):
+        """Clear the form fields in the browser."""
+        events = [rx.set_value(field_id, "") for field_id in CONTACT_FIELD_IDS]
+        if delivery.queue.digest["window"]:
+            events.append(rx.call_script(f"document.getElementById('{CONTACT_URGENT_ID}').checked = false"))
+        return events
+
+    @metrics.timed
+    def handle_submit(self, form_data: dict):
+        """Handle form submission with basic validation."""
+        name, email, message = (str(form_data.get(key, "")) for key in ("name", "email", "message"))
+
+        session = self.router.session
+        self.status, job_id = contact.submit(
+            name,
+            email,
+            message,
+            client=session.client_ip or session.client_token,
+            session=session.client_token,
+            urgent=bool(form_data.get("urgent")),
+        )
+        if job_id is None:
             return
-        
-        self.send_email()
-    
-    def scroll_to_top(self):
-        """Scroll to the top of the page."""
-        return rx.call_script("window.scrollTo({top: 0, behavior: 'smooth'})")
+        return [*self.reset_form(), State.wait_for_delivery(job_id)]
 
 hover_animation: dict = {
     "transition": "transform 0.3s ease",
@@ -124,6 +106,59 @@ cursor_blink: dict = {
     "animation": "blink 1s step-end infinite",
 }
 
+DOTS_LIGHT = "radial-gradient(circle, rgba(0,0,0,0.35) 1px, transparent 1px)"
+DOTS_DARK = "radial-gradient(circle, rgba(255,255,255,0.09) 1px, transparent 1px)"
+# The colour mode overrides only swap the image: they are more specific than the
+# base rule, so a `background` shorthand there would reset background_size.
+
+reduced_motion: dict = {
+    "@media (prefers-reduced-motion: reduce)": {"animation": "none", "transition": "none"},
+}
+# Set by PAUSE_OFFSCREEN_JS while an element is scrolled out of view.
+offscreen: dict = {"&[data-offscreen]": {"animation_play_state": "paused"}}
+
+# The dots sit on a fixed layer behind the page and slide as a whole, so the
+# compositor moves one texture instead of the page repainting every frame.
+dots_layer: dict = {
+    "@keyframes dots-drift": {
+        "0%": {"transform": "translate3d(0, 0, 0)"},
+        "100%": {"transform": "translate3d(40px, 40px, 0)"},
+    },
+    "isolation": "isolate",
+    "_before": {
+        "content": '""',
+        "position": "fixed",
+        "inset": "-40px",
+        "z_index": "-1",
+        "pointer_events": "none",
+        "will_change": "transform",
+        "background": dots["background"],
+        "background_size": dots["background_size"],
+        "animation": "dots-drift 4s linear infinite alternate-reverse both",
+        **reduced_motion,
+    },
+    "light": {"_before": {"background_image": DOTS_LIGHT}},
+    "dark": {"_before": {"background_image": DOTS_DARK}},
+}
+
+# "classic" animates background_position on the page itself, repainting the
+# whole viewport every frame. "compositor" only animates transform and opacity,
+# pauses loops that are off-screen and honours prefers-reduced-motion.
+ANIMATIONS: dict = {
+    "classic": {
+        "background": {**dots, "light": {"background_image": DOTS_LIGHT}, "dark": {"background_image": DOTS_DARK}},
+        "wave": wave,
+        "cursor": cursor_blink,
+        "hover": hover_animation,
+    },
+    "compositor": {
+        "background": dots_layer,
+        "wave": {**wave, **offscreen, **reduced_motion},
+        "cursor": {**cursor_blink, **offscreen, **reduced_motion},
+        "hover": {**hover_animation, **reduced_motion},
+    },
+}
+
 css: dict = {
     "app": {
         "dark": {"bg": "#15171b", "color": "white"},
@@ -158,6 +193,218 @@ css: dict = {
     }
 }
 
+muted: dict = {"dark": {"color": "rgba(255,255,255,0.7)"}}
+terminal: dict = {"font_family": "monospace", "color": "rgba(0, 255, 0, 0.8)"}
+section_heading: dict = {
+    "font_size": "2rem",
+    "font_weight": "600",
+    "margin_bottom": "0.5rem",
+    "text_align": "center",
+}
+field_width: dict = {"width": ["90%", "80%", "80%"]}
+
+# Shared classes, compiled once into assets/shared.css instead of being inlined
+# into every component that uses them.
+sheet = Stylesheet()
+motion = ANIMATIONS[ANIMATION_MODE]
+HOVER_GROW = sheet.add(motion["hover"])
+WAVE = sheet.add(motion["wave"])
+MUTED = sheet.add(muted)
+TERMINAL = sheet.add(terminal)
+SECTION_HEADING = " ".join([TERMINAL, sheet.add(section_heading)])
+FIELD = sheet.add(field_width)
+HEADER = sheet.add({**css["header"], "position": "sticky", "top": "0", "z_index": "1000", "margin_top": "0.5rem"})
+MAIN = sheet.add(css["main"]["property"])
+FOOTER = sheet.add(css["footer"])
+BACKGROUND = sheet.add(motion["background"])
+NAME = sheet.add({
+    "font_size": ["2rem", "2.85rem", "4rem", "5rem", "5rem"],
+    "font_weight": "900",
+    "background": "linear-gradient(to right, rgba(169, 169, 169, 0.8), rgba(105, 105, 105, 0.8))",
+    "background_clip": "text",
+    "-webkit-background-clip": "text",
+    "-moz-background-clip": "text",
+    "color": "transparent",
+    "display": "inline-block",
+    "white_space": "nowrap",
+    "line_height": "1.2",
+    "padding": "0.2em 0",
+    "vertical_align": "middle",
+})
+CURSOR = sheet.add({**motion["cursor"], "position": "relative", "top": "-11px"})
+BADGE = sheet.add({"padding": ["0.15rem 0.35rem", "0.15rem 0.35rem", "0.15rem 1rem", "0.15rem 1rem", "0.15rem 1rem"]})
+SKILL_ICON = " ".join([MUTED, sheet.add({"font_size": "36px"})])
+SKILL_NAME = " ".join([MUTED, sheet.add({"font_size": "14px", "text_align": "center"})])
+CARD = sheet.add({
+    "width": "300px",
+    "margin": "1rem",
+    "box_shadow": "0 4px 8px rgba(0, 0, 0, 0.2)",
+    "border_radius": "10px",
+    "overflow": "hidden",
+})
+SCROLL_BUTTON = sheet.add({
+    "position": "fixed",
+    "bottom": "2rem",
+    "right": "2rem",
+    "padding": "0.5rem",
+    "font_size": "1.5rem",
+    "border_radius": "50%",
+    "background": "rgba(0, 0, 0, 0.6)",
+    "color": "white",
+    "box_shadow": "0 2px 10px rgba(0, 0, 0, 0.2)",
+    "transition": "background 0.3s ease",
+    "_hover": {"background": "rgba(0, 0, 0, 0.8)"},
+    "_active": {"background": "rgba(0, 0, 0, 0.9)"},
+})
+
+# Contact-form island for the static export. The backend is only contacted once a
+# visitor focuses a field (preconnect) and when the form is submitted.
+CONTACT_ISLAND_JS: str = """
+(() => {
+    const form = document.getElementById("contact-island");
+    if (!form || form.dataset.ready) return;
+    form.dataset.ready = "1";
+    const endpoint = "__ENDPOINT__";
+    // Lets the server recognise a double-click or a retried request.
+    const session = crypto.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random()}`;
+    form.addEventListener("focusin", () => {
+        const link = document.createElement("link");
+        link.rel = "preconnect";
+        link.href = new URL(endpoint).origin;
+        document.head.appendChild(link);
+    }, { once: true });
+    form.addEventListener("submit", async (event) => {
+        event.preventDefault();
+        const status = document.getElementById("contact-status");
+        try {
+            const response = await fetch(endpoint, {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ ...Object.fromEntries(new FormData(form)), session }),
+            });
+            const result = await response.json();
+            status.textContent = result.status;
+            status.style.color = result.ok ? "green" : "red";
+            if (result.ok) form.reset();
+        } catch (error) {
+            status.textContent = `Failed to send your message: ${error}`;
+            status.style.color = "red";
+        }
+    });
+})();
+"""
+
+# Browser-side validation against contact.FIELD_CONSTRAINTS. The native bubble is
+# replaced by the same status messages the server would send, shown in
+# #contact-hint; the server still re-checks everything on submit.
+CONTACT_VALIDATION_JS: str = """
+(() => {
+    const messages = __MESSAGES__;
+    const hint = () => document.getElementById("contact-hint");
+    for (const id of __FIELD_IDS__) {
+        const field = document.getElementById(id);
+        if (!field || field.dataset.validation) continue;
+        field.dataset.validation = "1";
+        field.addEventListener("invalid", (event) => {
+            event.preventDefault();
+            if (field.form.querySelector(":invalid") !== field) return;
+            const flag = Object.keys(messages).find((key) => field.validity[key]);
+            hint().textContent = messages[flag] || field.validationMessage;
+            field.focus();
+        });
+        field.addEventListener("input", () => { hint().textContent = ""; });
+    }
+})();
+"""
+
+# Pause looping animations while they are scrolled out of view (compositor mode).
+# Elements added later, e.g. by a lazy section, are picked up as they appear.
+PAUSE_OFFSCREEN_JS: str = """
+(() => {
+    const observer = new IntersectionObserver((entries) => {
+        for (const entry of entries) {
+            entry.target.toggleAttribute("data-offscreen", !entry.isIntersecting);
+        }
+    });
+    const observed = new WeakSet();
+    const scan = () => document.querySelectorAll("__SELECTOR__").forEach((el) => {
+        if (observed.has(el)) return;
+        observed.add(el);
+        observer.observe(el);
+    });
+    scan();
+    new MutationObserver(scan).observe(document.body, { childList: true, subtree: true });
+})();
+"""
+
+# Real-user Web Vitals. Buffers LCP, CLS, INP, FCP and TTFB with the element
+# responsible and sends whatever changed since the last beacon when the page is
+# hidden.
+# INP is approximated by the slowest interaction, which it equals for pages
+# with fewer than 50 interactions.
+VITALS_JS: str = """
+(() => {
+    if (window.__vitals || !("PerformanceObserver" in window) || !navigator.sendBeacon) return;
+    window.__vitals = true;
+    const endpoint = "__ENDPOINT__";
+    const view = crypto.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random()}`;
+    const values = {}, sent = {};
+    const describe = (node) => {
+        if (!node || node.nodeType !== 1) return "";
+        const alt = node.getAttribute("alt");
+        return node.localName + (node.id ? `#${node.id}` : alt ? `[alt="${alt}"]` : "");
+    };
+    const observe = (type, callback, options = {}) => {
+        try {
+            new PerformanceObserver((list) => list.getEntries().forEach(callback))
+                .observe({ type, buffered: true, ...options });
+        } catch (error) {}
+    };
+    observe("navigation", (entry) => { values.TTFB = { value: entry.responseStart }; });
+    observe("paint", (entry) => {
+        if (entry.name === "first-contentful-paint") values.FCP = { value: entry.startTime };
+    });
+    observe("largest-contentful-paint", (entry) => {
+        values.LCP = { value: entry.startTime, target: describe(entry.element) };
+    });
+    let session = 0, first = 0, last = 0, target = "";
+    observe("layout-shift", (entry) => {
+        if (entry.hadRecentInput) return;
+        if (entry.startTime - last > 1000 || entry.startTime - first > 5000) {
+            session = 0;
+            first = entry.startTime;
+            target = "";
+        }
+        session += entry.value;
+        last = entry.startTime;
+        target = target || describe(entry.sources && entry.sources[0] && entry.sources[0].node);
+        if (!values.CLS || session > values.CLS.value) values.CLS = { value: session, target };
+    });
+    const interaction = (entry) => {
+        if (entry.interactionId && (!values.INP || entry.duration > values.INP.value)) {
+            values.INP = { value: entry.duration, target: describe(entry.target) };
+        }
+    };
+    // first-input also reports an interaction too fast for the event threshold.
+    observe("first-input", interaction);
+    observe("event", interaction, { durationThreshold: 40 });
+    const flush = () => {
+        const metrics = Object.entries(values)
+            .filter(([name, metric]) => sent[name] !== metric.value)
+            .map(([name, metric]) => ({ name, ...metric }));
+        if (!metrics.length) return;
+        // A string body goes out as text/plain, which needs no CORS preflight.
+        if (navigator.sendBeacon(endpoint, JSON.stringify({ view, route: location.pathname, metrics }))) {
+            metrics.forEach((metric) => { sent[metric.name] = metric.value; });
+        }
+    };
+    document.addEventListener("visibilitychange", () => {
+        if (document.visibilityState === "hidden") flush();
+    });
+    window.addEventListener("pagehide", flush);
+})();
+"""
+
 # Dark Mode Toggle Component
 def dark_mode_toggle() -> rx.Component:
     return rx.segmented_control.root(
@@ -180,26 +427,15 @@ def scroll_to_top_component() -> rx.Component:
     return rx.box(
         rx.button(
             "↑", 
-            on_click=State.scroll_to_top,
-            position="fixed",
-            bottom="2rem",
-            right="2rem",
-            padding="0.5rem",
-            font_size="1.5rem",
-            border_radius="50%", 
-            background="rgba(0, 0, 0, 0.6)",
-            color="white",  
-            box_shadow="0 2px 10px rgba(0, 0, 0, 0.2)",
-            transition="background 0.3s ease",
-            _hover={"background": "rgba(0, 0, 0, 0.8)"},
-            _active={"background": "rgba(0, 0, 0, 0.9)"},
+            on_click=rx.call_script(SCROLL_TO_TOP_JS),
+            class_name=SCROLL_BUTTON,
         )
     )
 
 # header class
 class Header:
     def __init__(self) -> None:
-        self.header: rx.Hstack = rx.hstack(style=css.get("header"), position="sticky", top="0", z_index="1000", margin_top="0.5rem")
+        self.header: rx.Hstack = rx.hstack(class_name=HEADER)
         self.theme: rx.Component = rx.box(dark_mode_toggle())
 
     def compile_component(self):
@@ -218,27 +454,14 @@ class Main:
         self.name: rx.Hstack = rx.hstack(
             rx.heading(
                 "Hi, I'm Lewis",
-                font_size=["2rem", "2.85rem", "4rem", "5rem", "5rem"],
-                font_weight="900",
-                style={
-                    "background": "linear-gradient(to right, rgba(169, 169, 169, 0.8), rgba(105, 105, 105, 0.8))",
-                    "background_clip": "text",
-                    "-webkit-background-clip": "text",
-                    "-moz-background-clip": "text",  
-                    "color": "transparent",
-                    "display": "inline-block",  
-                    "white_space": "nowrap", 
-                    "line_height": "1.2", 
-                    "padding": "0.2em 0", 
-                    "vertical_align": "middle",
-                },
+                class_name=NAME,
             ),
             rx.heading(
                 "👋🏻",
                 font_size="2rem",
                 font_weight="900",
                 vertical_align="middle",
-                style=wave,
+                class_name=WAVE,
             ),
             spacing="2",
             align_items="center",  # Ensure both headings are aligned vertically
@@ -246,15 +469,27 @@ class Main:
 
         # Badges Section
         titles = ["Cloud Security Engineer", "Security Engineer", "Systems Admin"]
-        self.badge_stack_max = rx.hstack(*[self.create_badge(title) for title in titles], spacing="3")
-        self.badge_stack_min = rx.hstack(*[self.create_badge(title) for title in titles], spacing="1")
+        self.badge_stack = rx.flex(
+            *[self.create_badge(title) for title in titles],
+            direction="row",
+            align="center",
+            spacing=rx.breakpoints(initial="1", xs="3"),
+        )
 
         # Sections
         self.crumbs = self.create_custom_breadcrumb()
         self.whoami = self.create_whoami_section()
         self.skills_section = self.create_skills_section()
-        self.contact: rx.Component = self.create_contact_form()
+        self.contact: rx.Component = self.create_contact_island() if STATIC_EXPORT else self.create_contact_form()
         self.cloud_security_section = self.create_cloud_security_section()
+        if LAZY_SECTIONS:
+            # Below the fold: placeholders about the size of each section, swapped in on approach.
+            self.whoami = lazy_section("whoami", self.whoami, min_height="16rem", margin_top="20rem")
+            self.skills_section = lazy_section("skills", self.skills_section, min_height="6rem")
+            self.cloud_security_section = lazy_section(
+                "cloud_security", self.cloud_security_section, min_height="48rem", margin_top="20rem"
+            )
+            self.contact = lazy_section("contact", self.contact, min_height="28rem", margin_top="20rem")
 
         self.scroll_to_top_button = scroll_to_top_component()
     
@@ -262,7 +497,7 @@ class Main:
         return rx.badge(
             title,
             variant="solid",
-            padding=["0.15rem 0.35rem", "0.15rem 0.35rem", "0.15rem 1rem", "0.15rem 1rem", "0.15rem 1rem"],
+            class_name=BADGE,
         )
 
     def create_skills_section(self) -> rx.Component:
@@ -274,8 +509,8 @@ class Main:
         ]
         skill_items = [
             rx.vstack(
-                rx.text(skill["icon"], font_size="36px", dark={"color": "rgba(255,255,255,0.7)"}),
-                rx.text(skill["name"], font_size="14px", dark={"color": "rgba(255,255,255,0.7)"}, text_align="center"),
+                rx.text(skill["icon"], class_name=SKILL_ICON),
+                rx.text(skill["name"], class_name=SKILL_NAME),
                 spacing="2",
                 align_items="center"
             )
@@ -283,37 +518,60 @@ class Main:
         ]
         return rx.hstack(*skill_items, spacing="4", justify_content="center", align_items="center")
 
-    def create_contact_form(self) -> rx.Component:
-        return rx.box(
-            rx.vstack(
+    def create_urgent_checkbox(self) -> rx.Component:
+        """Lets a visitor skip the digest; only shown when submissions are batched."""
+        return rx.el.label(
+            rx.el.input(type="checkbox", name="urgent", value="1", id=CONTACT_URGENT_ID),
+            " Urgent, please don't wait for the next digest",
+            class_name=MUTED,
+        )
+
+    def create_contact_fields(self) -> list[rx.Component]:
+        """Uncontrolled form fields, validated by the browser and only read on submit."""
+        return [
             rx.heading(
                 "Contact",
                 font_size=["1.5rem", "2rem", "2rem"],
-                font_weight="600",
-                font_family="monospace",
-                color="rgba(0, 255, 0, 0.8)",
-                margin_bottom="0.5rem",
-                text_align="center",
+                class_name=SECTION_HEADING,
             ),
-            rx.input(placeholder="Name", value=State.name, on_change=State.set_name, width=["90%", "80%", "80%"], spacing="2"),
-            rx.input(placeholder="Email", type="email", value=State.email, on_change=State.set_email, width=["90%", "80%", "80%"], spacing="2"),
-            rx.text_area(placeholder="Message", value=State.message, on_change=State.set_message, width=["90%", "80%", "80%"], spacing="2"),
-            rx.button("Send", on_click=State.handle_submit, color_scheme="blue", width=["90%", "80%", "80%"], spacing="2"),
-            rx.cond(
-                State.status.contains("successfully"),
-                rx.text(
-                State.status,
-                color="green",
-                margin_top="1rem",
-                ),
-                rx.text(
-                State.status,
-                color="red",
-                margin_top="1rem",
-                )
+            rx.input(placeholder="Name", name="name", id="contact_name", class_name=FIELD,
+                     custom_attrs=contact.FIELD_CONSTRAINTS["name"]),
+            rx.input(placeholder="Email", name="email", id="contact_email", type="email", class_name=FIELD,
+                     custom_attrs=contact.FIELD_CONSTRAINTS["email"]),
+            rx.text_area(placeholder="Message", name="message", id="contact_message", class_name=FIELD,
+                         custom_attrs=contact.FIELD_CONSTRAINTS["message"]),
+            *([self.create_urgent_checkbox()] if delivery.queue.digest["window"] else []),
+            rx.button("Send", type="submit", color_scheme="blue", class_name=FIELD),
+            rx.text(id="contact-hint", color="red"),
+            rx.script(
+                CONTACT_VALIDATION_JS
+                .replace("__MESSAGES__", json.dumps(contact.CONSTRAINT_MESSAGES))
+                .replace("__FIELD_IDS__", json.dumps(CONTACT_FIELD_IDS))
             ),
-                align_items="center",
-                justify_content="center",
+        ]
+
+    def create_contact_form(self) -> rx.Component:
+        return rx.box(
+            rx.form(
+                rx.vstack(
+                    *self.create_contact_fields(),
+                    rx.cond(
+                        State.status.contains("successfully") | State.status.contains("queued"),
+                        rx.text(
+                        State.status,
+                        color="green",
+                        margin_top="1rem",
+                        ),
+                        rx.text(
+                        State.status,
+                        color="red",
+                        margin_top="1rem",
+                        )
+                    ),
+                    align_items="center",
+                    justify_content="center",
+                ),
+                on_submit=State.handle_submit,
             ),
             spacing="6",
             align_items="center",
@@ -324,25 +582,31 @@ class Main:
             max_width="600px",
         )
 
+    def create_contact_island(self) -> rx.Component:
+        """Uncontrolled contact form for the static export, posting to the backend directly."""
+        return rx.box(
+            rx.el.form(
+                rx.vstack(
+                    *self.create_contact_fields(),
+                    rx.text(id="contact-status", margin_top="1rem"),
+                    align_items="center",
+                    justify_content="center",
+                ),
+                id="contact-island",
+            ),
+            rx.script(CONTACT_ISLAND_JS.replace("__ENDPOINT__", f"{get_config().api_url}/api/contact")),
+            padding="5",
+            margin_top="20rem",
+            width="100%",
+            max_width="600px",
+        )
+
     def create_whoami_section(self) -> rx.Component:
         return rx.vstack(
             rx.box(
                 rx.hstack(
-                    rx.heading(
-                        "whoami",
-                        font_size="2rem",
-                        font_weight="700",
-                        font_family="monospace",
-                        color="rgba(0, 255, 0, 0.8)",
-                    ),
-                    rx.text(
-                        "_",
-                        font_size="2rem",
-                        font_weight="700",
-                        font_family="monospace",
-                        color="rgba(0, 255, 0, 0.8)",
-                        style={**cursor_blink, "position": "relative", "top": "-11px"},  # Adjust position
-                    ),
+                    rx.heading("whoami", font_size="2rem", font_weight="700", class_name=TERMINAL),
+                    rx.text("_", font_size="2rem", font_weight="700", class_name=f"{TERMINAL} {CURSOR}"),
                     spacing="1",
                 ),
                 background="black",
@@ -357,7 +621,7 @@ class Main:
                 "I work with various cloud platforms to design, implement, and manage security measures "
                 "that ensure the confidentiality, integrity, and availability of various environments.",
                 font_size="1rem",
-                dark={"color": "rgba(255, 255, 255, 0.7)"},
+                class_name=MUTED,
                 line_height="1.5",
                 spacing="3",
                 text_align="center",
@@ -381,8 +645,8 @@ class Main:
             breadcrumb_items.append(
                 rx.link(
                     rx.vstack(
-                        rx.icon(tag=icon_name, box_size="24px", dark={"color": "rgba(255,255,255,0.7)"}),
-                        rx.text(title, font_size="12px", dark={"color": "rgba(255,255,255,0)"}, text_align="center"),
+                        rx.icon(tag=icon_name, box_size="24px", class_name=MUTED),
+                        rx.text(title, font_size="12px", text_align="center", class_name=MUTED),
                         spacing="2",
                         align_items="center"
                     ),
@@ -392,7 +656,7 @@ class Main:
                 )
             )
             if i < len(data) - 1:
-                breadcrumb_items.append(rx.text("", margin="0 8px", dark={"color": "rgba(255,255,255,0)"}))
+                breadcrumb_items.append(rx.text("", margin="0 8px"))
 
         return rx.hstack(
             *breadcrumb_items,
@@ -402,51 +666,21 @@ class Main:
         )
     
     def create_cloud_security_section(self) -> rx.Component:
-        projects = [
-            {
-                "title": "AWS Security Architecture",
-                "description": "Implemented a multi-layer security architecture for a large-scale AWS deployment.",
-                "image": "https://media.licdn.com/dms/image/D4D12AQG49qCkkRk6aw/article-cover_image-shrink_720_1280/0/1691813758023?e=2147483647&v=beta&t=P-f10sxwCtfIc0lWnyFTf9z_7Z14jtsT8K2XcXx1DxQ",  # Replace with actual image URL
-            },
-            {
-                "title": "Automated Firewall Policy Checks",
-                "description": "Developed automated security compliance checks using ServiceNow API, Lambda and various other aws services.",
-                "image": "https://www.eqs.com/assets/2021/03/EQS-Blog_Compliance-Management.jpg",  # Replace with actual image URL
-            },
-            {
-                "title": "Cyberark PAM Implementation",
-                "description": "Designed and deployed a secure CyberArk PAM environment. This was fully automated within AWS.",
-                "image": "https://mms.businesswire.com/media/20241113416461/en/1950794/23/CyberArk_Logo_November_2023.jpg",  # Replace with actual image URL
-            },
-        ]
-
         project_cards = [
             rx.box(
-                rx.image(src=project["image"], alt=project["title"], width="100%", height="auto", style=hover_animation),
+                project_image(project["image"], alt=project["title"], width="100%", height="auto", class_name=HOVER_GROW),
                 rx.box(
                     rx.heading(project["title"], size="5"),
                     rx.text(project["description"]),
                     padding="1rem",
                 ),
-                width="300px",
-                margin="1rem",
-                box_shadow="0 4px 8px rgba(0, 0, 0, 0.2)",
-                border_radius="10px",
-                overflow="hidden",
+                class_name=CARD,
             )
-            for project in projects
+            for project in PROJECTS
         ]
 
         return rx.box(
-            rx.heading(
-                "Certifications",
-                font_size="2rem",
-                font_weight="600",
-                font_family="monospace",
-                color="rgba(0, 255, 0, 0.8)",
-                margin_bottom="0.5rem",
-                text_align="center",
-            ),
+            rx.heading("Certifications", class_name=SECTION_HEADING),
             rx.vstack(
                 rx.hstack(
                     rx.icon(tag="shield", box_size="24px", color="rgba(0, 255, 0, 0.8)"),
@@ -469,20 +703,11 @@ class Main:
                 align_items="center",
                 justify_content="center",
                 spacing="2",
-                dark={"color": "rgba(255, 255, 255, 0.7)"},
+                class_name=MUTED,
                 margin_top="2rem",
                 margin_bottom="4rem",
             ),
-            rx.heading(
-                "Projects",
-                font_size="2rem",
-                font_weight="600",
-                font_family="monospace",
-                color="rgba(0, 255, 0, 0.8)",
-                margin_top="1rem",
-                margin_bottom="0.5rem",
-                text_align="center",
-            ),
+            rx.heading("Projects", margin_top="1rem", class_name=SECTION_HEADING),
             rx.hstack(
                 *project_cards,
                 spacing="2",
@@ -497,40 +722,24 @@ class Main:
             margin_top="20rem",
         )
 
-    def compile_desktop_component(self):
-        return rx.tablet_and_desktop(
-            rx.vstack(
-                self.name,
-                self.badge_stack_max,
-                self.crumbs,
-                self.whoami,
-                self.skills_section,
-                self.cloud_security_section,
-                self.contact,
-                self.scroll_to_top_button,
-                style=css.get("main").get("property"),
-                spacing="7",
-                flex="1",
-            )
-        )
-    
-    def compile_mobile_component(self):
-        return rx.mobile_only(
-            rx.vstack(
-                self.name,
-                self.badge_stack_min,
-                self.crumbs,
-                self.whoami,
-                self.skills_section,
-                self.cloud_security_section,
-                self.contact,
-                self.scroll_to_top_button,
-                style=css.get("main").get("property"),
-            )
+    def compile_component(self):
+        return rx.flex(
+            self.name,
+            self.badge_stack,
+            self.crumbs,
+            self.whoami,
+            self.skills_section,
+            self.cloud_security_section,
+            self.contact,
+            self.scroll_to_top_button,
+            class_name=MAIN,
+            direction="column",
+            spacing=rx.breakpoints(initial="3", xs="7"),
+            flex="1",
         )
     
     def build(self):
-        self.box.children = [self.compile_desktop_component(), self.compile_mobile_component()]
+        self.box.children = [self.compile_component()]
         return self.box
 
 # footer class
@@ -538,7 +747,7 @@ class Footer:
     def __init__(self) -> None:
         self.footer: rx.Hstack = rx.hstack(
             id="footer",
-            style={**css.get("footer")},
+            class_name=FOOTER,
         )
         self.footer.children.append(
             rx.text(
@@ -552,7 +761,7 @@ class Footer:
         return self.footer
 
 
-@rx.page(route="/", on_load=State.on_mount, title="Lewis McDonald")
+@rx.page(route="/", on_load=None if STATIC_EXPORT else State.on_mount, title="Lewis McDonald")
 def landing() -> rx.Component:
     header: object = Header().build()
     main: object = Main().build()
@@ -562,20 +771,28 @@ def landing() -> rx.Component:
         header,
         main,
         footer,
-        # Styles
-        #background
-        light={
-            "background": "radial-gradient(circle, rgba(0,0,0,0.35) 1px, transparent 1px)",
-            "background_size":"25px 25px",
-            "animation": "dots 4s linear infinite alternate-reverse both",
-        },
-        dark={
-            "background": "radial-gradient(circle, rgba(255,255,255,0.09) 1px, transparent 1px)",
-            "background_size": "25px 25px",
-            "animation": "dots 4s linear infinite alternate-reverse both",
-        }, 
-        style=dots,
+        *(
+            [rx.script(PAUSE_OFFSCREEN_JS.replace("__SELECTOR__", f".{WAVE}, .{CURSOR}"))]
+            if ANIMATION_MODE == "compositor"
+            else []
+        ),
+        *([rx.script(VITALS_JS.replace("__ENDPOINT__", f"{get_config().api_url}/api/vitals"))] if VITALS else []),
+        class_name=BACKGROUND,
     )
 
-app = rx.App(style=css.get("app"))
-app._compile()
\ No newline at end of file
+class PortfolioApp(LazySections, SharedState, CompactSessions, CachedApp):
+    """Lazily loaded sections, cached frontend builds, compact expiring session state and multi-worker event routing."""
+
+
+app = PortfolioApp(style=css.get("app"), generated_stylesheets=[sheet])
+# Drain submissions left in the outbox by a restart or crash without waiting for a new one.
+app.register_lifespan_task(delivery.lifespan)
+app.api.add_api_route("/api/contact", contact.contact_endpoint, methods=["POST"])
+if metrics.ENABLED:
+    app.api.add_api_route("/metrics", metrics.metrics_endpoint, methods=["GET"])
+if VITALS:
+    app.api.add_api_route("/api/vitals", vitals.vitals_endpoint, methods=["POST"])
+    app.api.add_api_route("/api/vitals", vitals.vitals_summary_endpoint, methods=["GET"])
+if STATIC_SITE:
+    # Last, so the API routes above take precedence over the catch-all.
+    app.api.mount("/", StaticSite(STATIC_SITE), name="static_site")
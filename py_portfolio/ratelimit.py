@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+from reflex.config import get_config
+
+# Used when rxconfig.py doesn't set `rate_limits`. `"enabled": False` lets
+# everything through, e.g. for load tests.
+DEFAULT_LIMITS: dict = {
+    "enabled": True,
+    "client": {"capacity": 3, "per_second": 1 / 60},
+    "sender": {"capacity": 5, "per_second": 1 / 600},
+    "vitals": {"capacity": 10, "per_second": 1 / 10},
+    "vitals_summary": {"capacity": 5, "per_second": 1 / 60},
+    "max_tracked": 10_000,
+}
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float, now: float) -> None:
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, capacity: float, per_second: float, now: float) -> bool:
+        self.tokens = min(capacity, self.tokens + (now - self.updated) * per_second)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class RateLimiter:
+    """Token buckets keyed by scope and key, held in a bounded LRU.
+
+    Each scope (e.g. "client", "sender") has its own capacity and refill
+    rate. Once more than `max_tracked` keys are held, the least recently
+    used bucket is dropped; a dropped key simply starts again from full.
+    """
+
+    def __init__(self, limits: dict | None = None) -> None:
+        self._limits: dict | None = None
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.rejected: dict[str, int] = {}
+        if limits is not None:
+            self.configure(limits)
+
+    @property
+    def limits(self) -> dict:
+        if self._limits is None:
+            self.configure(getattr(get_config(), "rate_limits", None) or {})
+        return self._limits
+
+    def configure(self, limits: dict) -> None:
+        """Apply `limits` over DEFAULT_LIMITS, starting every key from a full bucket."""
+        limits = {**DEFAULT_LIMITS, **limits}
+        # With no room for a single bucket every key would start full each time.
+        if not isinstance(limits["max_tracked"], int) or limits["max_tracked"] < 1:
+            raise ValueError(
+                f"rate_limits: max_tracked must be at least 1, not {limits['max_tracked']!r}"
+                ' (set "enabled": false to turn rate limiting off)'
+            )
+        with self._lock:
+            self._limits = limits
+            self._buckets.clear()
+
+    def allow(self, scope: str, key: str) -> bool:
+        """Take a token for `key` in `scope`, returning False if none are left."""
+        limits = self.limits
+        limit = limits.get(scope)
+        if not limits["enabled"] or not limit or not key:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get((scope, key))
+            if bucket is None:
+                bucket = self._buckets[(scope, key)] = TokenBucket(limit["capacity"], now)
+                if len(self._buckets) > limits["max_tracked"]:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end((scope, key))
+            allowed = bucket.take(limit["capacity"], limit["per_second"], now)
+            if not allowed:
+                self.rejected[scope] = self.rejected.get(scope, 0) + 1
+            return allowed
+
+
+limiter = RateLimiter()
@@ -0,0 +1,179 @@
+import asyncio
+import contextlib
+import pickle
+import time
+from typing import Any, AsyncIterator, Dict
+from reflex.config import get_config
+from reflex.istate.data import RouterData
+from reflex.state import BaseState, StateManager, StateManagerDisk, StateManagerMemory, _split_substate_key
+from . import metrics
+
+# Used when rxconfig.py doesn't set `sessions`.
+DEFAULT_SESSIONS: dict = {"ttl": 30 * 60, "max_bytes": 64 * 2**20}
+
+# Rebuilt from the stored router data.
+EPHEMERAL_VARS = {"router"}
+
+
+def _walk(state: BaseState):
+    yield state
+    for substate in state.substates.values():
+        yield from _walk(substate)
+
+
+class CompactStateManager(StateManager):
+    """In-memory state manager that keeps each session as a tuple of changed vars.
+
+    Reflex's memory manager holds a full State tree for every token that ever
+    connected. Here a tree only exists while an event holds the session's
+    lock; between events a session is just its router data (without it
+    Reflex would ask the browser to reload) and the vars that differ from
+    their defaults, which for a visitor who never touches the form is none.
+    Sessions idle for longer than `ttl` seconds are dropped, and the least
+    recently used ones go first once the stored sessions exceed `max_bytes`.
+    An evicted visitor's next event reloads the page and starts afresh.
+    """
+
+    ttl: float = DEFAULT_SESSIONS["ttl"]
+    max_bytes: int = DEFAULT_SESSIONS["max_bytes"]
+    # token -> (router data, packed vars, pickled size, last used), least recently used first.
+    sessions: Dict[str, Any] = {}
+    # token -> the materialized state while an event holds its lock.
+    live: Dict[str, Any] = {}
+    # token -> [lock, holders and waiters]
+    locks: Dict[str, Any] = {}
+    # (state name, var) -> default value
+    defaults: Dict[Any, Any] = {}
+    held_bytes: int = 0
+    evictions: Dict[str, int] = {"expired": 0, "memory": 0}
+
+    def pack(self, state: BaseState) -> tuple:
+        """The vars of the whole tree that differ from their defaults."""
+        if not self.defaults:
+            self.defaults = {
+                (substate.get_full_name(), var): substate.__dict__.get(var)
+                for substate in _walk(self.state(_reflex_internal_init=True))
+                for var in substate.base_vars
+            }
+        return tuple(
+            (name, var, value)
+            for substate in _walk(state)
+            for name in [substate.get_full_name()]
+            for var in substate.base_vars
+            if var not in EPHEMERAL_VARS
+            and (value := substate.__dict__.get(var)) != self.defaults.get((name, var))
+        )
+
+    def materialize(self, token: str) -> BaseState:
+        state = self.state(_reflex_internal_init=True)
+        entry = self.sessions.get(token)
+        if entry is not None:
+            router_data, packed = entry[:2]
+            state.router_data = router_data
+            state.router = RouterData(router_data)
+            for name, var, value in packed:
+                setattr(state.get_substate(name.split(".")), var, value)
+            state._clean()
+        return state
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "live": len(self.live),
+            "bytes": self.held_bytes,
+            "bytes_per_session": self.held_bytes / len(self.sessions) if self.sessions else 0,
+            "evicted_expired": self.evictions["expired"],
+            "evicted_memory": self.evictions["memory"],
+        }
+
+    def _drop(self, token: str) -> None:
+        entry = self.sessions.pop(token, None)
+        if entry is not None:
+            self.held_bytes -= entry[2]
+
+    def _store(self, token: str, state: BaseState) -> None:
+        self._drop(token)
+        packed = self.pack(state)
+        if state.router_data or packed:
+            size = len(pickle.dumps((state.router_data, packed)))
+            self.sessions[token] = (state.router_data, packed, size, time.monotonic())
+            self.held_bytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self.sessions:
+            token, (*_, last_used) = next(iter(self.sessions.items()))
+            if now - last_used > self.ttl:
+                self.evictions["expired"] += 1
+            elif self.held_bytes > self.max_bytes:
+                self.evictions["memory"] += 1
+            else:
+                break
+            self._drop(token)
+
+    async def get_state(self, token: str) -> BaseState:
+        # Like the memory manager, ignore the substate suffix and return the whole tree.
+        token = _split_substate_key(token)[0]
+        if token in self.live:
+            return self.live[token]
+        return self.materialize(token)
+
+    async def set_state(self, token: str, state: BaseState):
+        self._store(_split_substate_key(token)[0], state)
+
+    @contextlib.asynccontextmanager
+    async def modify_state(self, token: str) -> AsyncIterator[BaseState]:
+        token = _split_substate_key(token)[0]
+        entry = self.locks.setdefault(token, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                state = self.live[token] = self.materialize(token)
+                try:
+                    yield state
+                finally:
+                    del self.live[token]
+                    self._store(token, state)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.locks[token]
+
+
+manager: CompactStateManager | None = None
+
+
+class CompactSessions:
+    """App mixin that replaces Reflex's memory and disk state managers with CompactStateManager.
+
+    The disk manager (Reflex's default) also keeps every tree in memory and
+    pickles it on each event; sessions here don't survive a restart, which is
+    fine for a status line. A redis state manager is left alone.
+    """
+
+    def _setup_state(self) -> None:
+        global manager
+        super()._setup_state()
+        if isinstance(self._state_manager, (StateManagerMemory, StateManagerDisk)):
+            limits = getattr(get_config(), "sessions", None) or DEFAULT_SESSIONS
+            manager = self._state_manager = CompactStateManager(state=self.state, **limits)
+
+
+def _session_metrics() -> list[str]:
+    stats = manager.stats() if manager is not None else {}
+    return [
+        "# HELP portfolio_sessions Sessions held in memory on this worker.",
+        "# TYPE portfolio_sessions gauge",
+        f"portfolio_sessions {stats.get('sessions', 0)}",
+        "# HELP portfolio_session_bytes Packed size of all held sessions.",
+        "# TYPE portfolio_session_bytes gauge",
+        f"portfolio_session_bytes {stats.get('bytes', 0)}",
+        "# HELP portfolio_sessions_evicted_total Sessions dropped for being idle or for memory.",
+        "# TYPE portfolio_sessions_evicted_total counter",
+        f'portfolio_sessions_evicted_total{{reason="expired"}} {stats.get("evicted_expired", 0)}',
+        f'portfolio_sessions_evicted_total{{reason="memory"}} {stats.get("evicted_memory", 0)}',
+    ]
+
+
+metrics.registry.collectors.append(_session_metrics)
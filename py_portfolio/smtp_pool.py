@@ -0,0 +1,144 @@
+import smtplib
+import threading
+import time
+from dataclasses import dataclass, field
+from email.message import Message
+from .metrics import smtp_errors, smtp_seconds, timer
+
+
+@dataclass
+class _Session:
+    server: smtplib.SMTP
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    messages: int = 0
+
+
+class SMTPPool:
+    """A small pool of warm, authenticated SMTP sessions.
+
+    Idle sessions are health-checked with NOOP before reuse and recycled once
+    they have been idle for `idle_timeout` seconds or have sent `max_messages`
+    messages. A session the server dropped is replaced transparently.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        size: int = 2,
+        idle_timeout: float = 60.0,
+        max_messages: int = 100,
+        timeout: float = 10.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self._idle: list[_Session] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self.counters = {
+            "connects": 0,
+            "reuses": 0,
+            "reconnects": 0,
+            "recycled": 0,
+            "messages": 0,
+        }
+
+    def stats(self) -> dict:
+        """Return a snapshot of the pool counters."""
+        with self._lock:
+            return {**self.counters, "idle": len(self._idle)}
+
+    def send_message(self, msg: Message) -> None:
+        """Send a message over a pooled session, reconnecting once if the server dropped it."""
+        with self._slots:
+            for attempt in range(2):
+                session = self._acquire()
+                try:
+                    with timer(smtp_seconds, smtp_errors, op="send"):
+                        session.server.send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    self._discard(session)
+                    if attempt:
+                        raise
+                    self._count("reconnects")
+                    continue
+                except Exception:
+                    self._discard(session)
+                    raise
+                session.messages += 1
+                self._count("messages")
+                self._release(session)
+                return
+
+    def close(self) -> None:
+        """Close every idle session."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for session in idle:
+            self._discard(session)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def _connect(self) -> _Session:
+        with timer(smtp_seconds, smtp_errors, op="connect"):
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.starttls:
+                with timer(smtp_seconds, smtp_errors, op="starttls"):
+                    server.starttls()
+            if self.username:
+                with timer(smtp_seconds, smtp_errors, op="login"):
+                    server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._count("connects")
+        return _Session(server)
+
+    def _acquire(self) -> _Session:
+        while True:
+            with self._lock:
+                session = self._idle.pop() if self._idle else None
+            if session is None:
+                return self._connect()
+            if (
+                time.monotonic() - session.last_used > self.idle_timeout
+                or session.messages >= self.max_messages
+            ):
+                self._count("recycled")
+                self._discard(session)
+                continue
+            try:
+                code, _ = session.server.noop()
+            except (smtplib.SMTPException, OSError):
+                code = None
+            if code != 250:
+                self._count("reconnects")
+                self._discard(session)
+                continue
+            self._count("reuses")
+            return session
+
+    def _release(self, session: _Session) -> None:
+        session.last_used = time.monotonic()
+        with self._lock:
+            self._idle.append(session)
+
+    def _discard(self, session: _Session) -> None:
+        try:
+            session.server.quit()
+        except (smtplib.SMTPException, OSError):
+            session.server.close()
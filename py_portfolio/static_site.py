@@ -0,0 +1,223 @@
+"""Production build and server for the static export.
+
+    PORTFOLIO_STATIC=1 reflex export --frontend-only --no-zip
+    python -m py_portfolio.static_site
+
+Copies the export from .web/_static to site/. Every asset Next didn't
+already fingerprint (favicon.ico, the public stylesheet, ...) gets a copy
+named after its content hash, and the HTML refers to that copy; the
+original path stays for browsers that ask for it by name. Compressible
+files get gzip and, with the brotli package installed, brotli variants.
+site/assets.json records each file's hash, whether it is immutable and its
+variants. Unchanged files aren't recompressed.
+
+`StaticSite` serves the result: hashed assets with a one-year immutable
+Cache-Control, everything else with an ETag to revalidate against (and a
+304 when it still matches), picking the smallest variant the client
+accepts. With `static_site` set in rxconfig.py the backend serves it at /.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import re
+import sys
+from pathlib import Path
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+EXPORT_DIR = ROOT_DIR / ".web" / "_static"
+SITE_DIR = ROOT_DIR / "site"
+MANIFEST = "assets.json"
+
+# Next puts a content hash in the name of everything under _next/static;
+# the project images are named after theirs.
+PREHASHED = re.compile(r"^_next/static/|(^|[/.-])[0-9a-f]{8,}[.-]")
+COMPRESSIBLE = {".html", ".js", ".css", ".json", ".map", ".svg", ".txt", ".xml", ".ico", ".webmanifest"}
+# Files whose references to hashed copies are rewritten. Next's own bundles are
+# left byte for byte, since their names are derived from their content.
+REWRITTEN = {".html", ".css", ".json", ".webmanifest"}
+MIN_COMPRESS_BYTES = 256
+# Preferred first.
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+
+def load_manifest(site_dir: Path = SITE_DIR) -> dict:
+    """Return the manifest of a built site, or an empty one if nothing was built."""
+    try:
+        return json.loads((site_dir / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _hashed_name(rel: str, data: bytes) -> str:
+    path = Path(rel)
+    return path.with_name(f"{path.stem}.{hashlib.sha256(data).hexdigest()[:10]}{path.suffix}").as_posix()
+
+
+def _rewrite(data: bytes, renames: dict[str, str]) -> bytes:
+    """Point root-relative references to renamed files at their hashed copies."""
+    if not renames:
+        return data
+    names = b"|".join(re.escape(rel.encode()) for rel in sorted(renames, key=len, reverse=True))
+    pattern = re.compile(rb"(?<=[\"'(=\s])/(" + names + rb")(?=[\"')?#\s])")
+    return pattern.sub(lambda m: b"/" + renames[m.group(1).decode()].encode(), data)
+
+
+def compress(data: bytes) -> dict[str, bytes]:
+    """The encoded variants of `data` that are actually smaller than it."""
+    variants = {"gzip": gzip.compress(data, 9, mtime=0)}
+    try:
+        import brotli
+    except ImportError:
+        pass
+    else:
+        variants["br"] = brotli.compress(data, quality=11)
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+
+def build(export_dir: Path = EXPORT_DIR, site_dir: Path = SITE_DIR) -> dict:
+    """Fingerprint and precompress an export into `site_dir`, returning the manifest."""
+    if not (export_dir / "index.html").exists():
+        raise RuntimeError(
+            f"No export in {export_dir}; run `PORTFOLIO_STATIC=1 reflex export --frontend-only --no-zip` first"
+        )
+    files = {
+        path.relative_to(export_dir).as_posix(): path.read_bytes()
+        for path in sorted(export_dir.rglob("*"))
+        if path.is_file()
+    }
+
+    # Plain assets first, then the stylesheets etc. that may refer to them.
+    renames: dict[str, str] = {}
+    for rewritten in (False, True):
+        for rel in files:
+            suffix = Path(rel).suffix
+            if suffix == ".html" or PREHASHED.search(rel) or (suffix in REWRITTEN) != rewritten:
+                continue
+            if rewritten:
+                files[rel] = _rewrite(files[rel], renames)
+            renames[rel] = _hashed_name(rel, files[rel])
+    for rel in files:
+        if rel.endswith(".html"):
+            files[rel] = _rewrite(files[rel], renames)
+    files.update({hashed: files[rel] for rel, hashed in renames.items()})
+
+    cached = load_manifest(site_dir)
+    manifest = {}
+    for rel, data in files.items():
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        entry = cached.get(rel)
+        target = site_dir / rel
+        if not (
+            entry
+            and entry["etag"] == digest
+            and target.exists()
+            and all(Path(f"{target}{ENCODINGS[encoding]}").exists() for encoding in entry["encodings"])
+        ):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+            variants = compress(data) if target.suffix in COMPRESSIBLE and len(data) >= MIN_COMPRESS_BYTES else {}
+            for encoding, body in variants.items():
+                Path(f"{target}{ENCODINGS[encoding]}").write_bytes(body)
+            entry = {"etag": digest, "encodings": [encoding for encoding in ENCODINGS if encoding in variants]}
+        manifest[rel] = {**entry, "immutable": rel in renames.values() or bool(PREHASHED.search(rel))}
+
+    # Drop files from earlier builds.
+    keep = {site_dir / MANIFEST} | {
+        Path(f"{site_dir / rel}{suffix}")
+        for rel, entry in manifest.items()
+        for suffix in ["", *(ENCODINGS[encoding] for encoding in entry["encodings"])]
+    }
+    for path in sorted(site_dir.rglob("*"), reverse=True):
+        if path.is_file() and path not in keep:
+            path.unlink()
+        elif path.is_dir() and not any(path.iterdir()):
+            path.rmdir()
+    (site_dir / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _accepted(accept_encoding: str) -> set[str]:
+    """The content codings an Accept-Encoding header allows (anything not given q=0)."""
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        q = next((param[2:] for param in params if param.startswith("q=")), "1")
+        try:
+            if float(q) > 0:
+                accepted.add(name)
+        except ValueError:
+            pass
+    return accepted
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header names any representation of `etag`."""
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/").strip('"')
+        if tag == "*" or tag.split("-")[0] == etag:
+            return True
+    return False
+
+
+class StaticSite:
+    """ASGI app serving a site built by `build`."""
+
+    def __init__(self, site_dir: Path = SITE_DIR) -> None:
+        self.site_dir = Path(site_dir)
+        self.files = load_manifest(self.site_dir)
+
+    def resolve(self, path: str) -> str | None:
+        rel = path.strip("/")
+        for candidate in (rel, f"{rel}/index.html".lstrip("/"), f"{rel}.html"):
+            if candidate in self.files:
+                return candidate
+        return None
+
+    async def __call__(self, scope, receive, send) -> None:
+        response = self.response(scope["method"], scope["path"], Headers(scope=scope))
+        await response(scope, receive, send)
+
+    def response(self, method: str, path: str, request_headers: Headers) -> Response:
+        if method not in ("GET", "HEAD"):
+            return Response(status_code=405, headers={"Allow": "GET, HEAD"})
+        rel, status = self.resolve(path), 200
+        if rel is None:
+            rel, status = "404.html", 404
+            if rel not in self.files:
+                return Response("Not Found", status_code=404)
+        entry = self.files[rel]
+        headers = {
+            "Cache-Control": IMMUTABLE if entry["immutable"] else REVALIDATE,
+            "ETag": f'"{entry["etag"]}"',
+        }
+        if entry["encodings"]:
+            headers["Vary"] = "Accept-Encoding"
+        if status == 200 and _matches(request_headers.get("if-none-match", ""), entry["etag"]):
+            return Response(status_code=304, headers=headers)
+        accepted = _accepted(request_headers.get("accept-encoding", ""))
+        file = self.site_dir / rel
+        for encoding in entry["encodings"]:
+            if encoding in accepted:
+                headers["Content-Encoding"] = encoding
+                # The encoded bytes are a different representation.
+                headers["ETag"] = f'"{entry["etag"]}-{encoding}"'
+                file = Path(f"{file}{ENCODINGS[encoding]}")
+                break
+        media_type = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+        return FileResponse(file, status_code=status, headers=headers, media_type=media_type)
+
+
+if __name__ == "__main__":
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        print("brotli is not installed, writing gzip variants only", file=sys.stderr)
+    manifest = build()
+    immutable = sum(entry["immutable"] for entry in manifest.values())
+    print(f"{len(manifest)} files ({immutable} immutable) written to {SITE_DIR}")
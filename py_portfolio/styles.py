@@ -0,0 +1,114 @@
+"""Compile style dicts into shared CSS classes.
+
+Styles registered with `Stylesheet.add` are turned into plain CSS once, named
+after a hash of their declarations (so identical styles share a class), and
+written to a single stylesheet in assets/. Reflex imports it into the root
+stylesheet, which Next bundles into a fingerprinted, cacheable CSS file, so
+components only carry a `class_name` instead of an inline style object.
+
+The dicts use the same keys as Reflex style props: snake_case properties,
+`_hover`-style pseudo selectors, `&[attr]`-style selector suffixes,
+`dark`/`light` color-mode overrides, `@media` blocks, responsive lists and
+`@keyframes name` entries, which are emitted once.
+"""
+import hashlib
+from pathlib import Path
+from reflex.components.core.breakpoints import breakpoints_values
+from reflex.utils.format import to_kebab_case
+
+ASSETS_DIR = Path(__file__).resolve().parents[1] / "assets"
+
+# Reflex style shorthands, see reflex.style.STYLE_PROP_SHORTHAND_MAPPING.
+SHORTHANDS = {
+    "bg": ("background",),
+    "bg_color": ("background-color",),
+    "padding_x": ("padding-inline-start", "padding-inline-end"),
+    "padding_y": ("padding-top", "padding-bottom"),
+    "margin_x": ("margin-inline-start", "margin-inline-end"),
+    "margin_y": ("margin-top", "margin-bottom"),
+    # Radix components read their font from this variable rather than inheriting it.
+    "font_family": ("font-family", "--default-font-family"),
+}
+
+# next-themes puts the resolved color mode as a class on <html>.
+COLOR_MODES = ("dark", "light")
+
+
+def _declarations(style: dict) -> list[str]:
+    return [
+        f"{name}:{value}"
+        for key, value in style.items()
+        for name in SHORTHANDS.get(key, (to_kebab_case(key),))
+    ]
+
+
+def _media(index: int) -> str | None:
+    return None if index == 0 else f"@media screen and (min-width: {breakpoints_values[index - 1]})"
+
+
+class Stylesheet:
+    def __init__(self, filename: str = "shared.css", prefix: str = "s") -> None:
+        self.filename = filename
+        self.prefix = prefix
+        self.keyframes: dict[str, str] = {}
+        # class name -> [(media query or None, color-mode scope, pseudo selector, declarations)]
+        self.rules: dict[str, list[tuple]] = {}
+
+    def add(self, style: dict) -> str:
+        """Register a style and return the class name to use for it."""
+        blocks: list[tuple] = []
+        self._collect(style, blocks, None, "", "")
+        body = [(media, scope, suffix, ";".join(decls)) for media, scope, suffix, decls in blocks if decls]
+        digest = hashlib.sha1(repr(body).encode()).hexdigest()[:8]
+        name = f"{self.prefix}-{digest}"
+        self.rules.setdefault(name, body)
+        return name
+
+    def _collect(self, style: dict, blocks: list, media: str | None, scope: str, suffix: str) -> None:
+        plain: dict[str, str] = {}
+        responsive: dict[int, dict] = {}
+        nested: list[tuple[dict, str | None, str, str]] = []
+        for key, value in style.items():
+            if key.startswith("@keyframes"):
+                frames = "".join(f"{step}{{{';'.join(_declarations(decls))}}}" for step, decls in value.items())
+                self.keyframes.setdefault(key.split()[1], f"{key}{{{frames}}}")
+            elif key.startswith("@media"):
+                nested.append((value, key, scope, suffix))
+            elif key in COLOR_MODES:
+                nested.append((value, media, f".{key} ", suffix))
+            elif key.startswith("_"):
+                nested.append((value, media, scope, f"{suffix}:{to_kebab_case(key[1:])}"))
+            elif key.startswith("&"):
+                nested.append((value, media, scope, f"{suffix}{key[1:]}"))
+            elif isinstance(value, list):
+                plain[key] = value[0]
+                # Only emit a breakpoint where the value actually changes.
+                for index, (previous, item) in enumerate(zip(value, value[1:]), start=1):
+                    if item != previous:
+                        responsive.setdefault(index, {})[key] = item
+            else:
+                plain[key] = value
+        blocks.append((media, scope, suffix, _declarations(plain)))
+        for index, values in sorted(responsive.items()):
+            blocks.append((_media(index), scope, suffix, _declarations(values)))
+        # Overrides come after the base rule so they win at equal specificity.
+        for value, nested_media, nested_scope, nested_suffix in nested:
+            self._collect(value, blocks, nested_media, nested_scope, nested_suffix)
+
+    def render(self) -> str:
+        """Return the whole stylesheet as CSS text."""
+        lines = list(self.keyframes.values())
+        for name, body in self.rules.items():
+            for media, scope, suffix, decls in body:
+                rule = f"{scope}.{name}{suffix}{{{decls}}}"
+                lines.append(f"{media}{{{rule}}}" if media else rule)
+        return "\n".join(lines) + "\n"
+
+    def write(self, assets_dir: Path = ASSETS_DIR) -> str:
+        """Write the stylesheet into assets (only if it changed) and return its path for `rx.App(stylesheets=...)`."""
+        path = assets_dir / self.filename
+        css = self.render()
+        if not path.exists() or path.read_text() != css:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(css)
+        return f"/{self.filename}"
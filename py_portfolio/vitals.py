@@ -0,0 +1,192 @@
+import asyncio
+import itertools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from .ratelimit import limiter
+
+VITALS_PATH = os.getenv("VITALS_PATH", "vitals.db")
+
+# Largest plausible value per metric (milliseconds, CLS is unitless); anything
+# above is dropped as a broken or hostile sample.
+METRICS: dict[str, float] = {"LCP": 60_000, "FCP": 60_000, "TTFB": 60_000, "INP": 60_000, "CLS": 10}
+PERCENTILES = (50, 75, 95)
+MAX_BEACON_BYTES = 8 * 1024
+MAX_SAMPLES = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vitals (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    view TEXT NOT NULL,
+    route TEXT NOT NULL,
+    device TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    target TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS vitals_created ON vitals (created);
+"""
+
+
+def device_class(user_agent: str) -> str:
+    """Return "mobile" for phones, "desktop" for tablets and desktops ("Mobi" is only in phone user agents)."""
+    return "mobile" if "Mobi" in user_agent else "desktop"
+
+
+def percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, min(len(ordered) - 1, -(-p * len(ordered) // 100) - 1))]
+
+
+class VitalsStore:
+    """Web Vitals samples in SQLite, written in batches.
+
+    `add` only appends to a buffer; once it holds `flush_size` samples or
+    the oldest has waited `flush_interval` seconds, the batch is written in
+    one transaction. Samples still buffered when the process dies are lost,
+    which is fine for field data. A page view reports a metric again when it
+    gets worse (e.g. a late layout shift); summaries use its last value.
+    Summaries read through their own connection, so a slow one doesn't hold
+    up `add` (WAL lets it read while batches are written).
+    """
+
+    def __init__(self, path: str = VITALS_PATH, flush_size: int = 200, flush_interval: float = 5.0) -> None:
+        self.path = path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._buffer: list[tuple] = []
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._reader = sqlite3.connect(path, check_same_thread=False)
+        self._read_lock = threading.Lock()
+
+    def add(self, rows: list[tuple]) -> None:
+        """Buffer (created, view, route, device, metric, value, target) rows."""
+        with self._lock:
+            self._buffer.extend(rows)
+            if len(self._buffer) >= self.flush_size or self._buffer[0][0] <= time.time() - self.flush_interval:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        self._db.execute("BEGIN")
+        self._db.executemany(
+            "INSERT INTO vitals (created, view, route, device, metric, value, target) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            self._buffer,
+        )
+        self._db.execute("COMMIT")
+        self._buffer = []
+
+    def summary(self, since: float = 0.0) -> dict:
+        """Percentiles per route, device class and metric, for samples newer than `since`."""
+        self.flush()
+        with self._read_lock:
+            rows = self._reader.execute(
+                """
+                SELECT route, device, metric, value FROM vitals
+                WHERE id IN (SELECT MAX(id) FROM vitals WHERE created >= ? GROUP BY view, metric)
+                ORDER BY route, device, metric, value
+                """,
+                (since,),
+            ).fetchall()
+        summary: dict = {}
+        for (route, device, metric), group in itertools.groupby(rows, key=lambda row: row[:3]):
+            values = [row[3] for row in group]
+            stats = {"count": len(values)}
+            stats.update({f"p{p}": round(percentile(values, p), 4) for p in PERCENTILES})
+            summary.setdefault(route, {}).setdefault(device, {})[metric] = stats
+        return summary
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._db.close()
+        with self._read_lock:
+            self._reader.close()
+
+
+_store: VitalsStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> VitalsStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = VitalsStore()
+        return _store
+
+
+def parse_beacon(body: bytes, user_agent: str, now: float) -> list[tuple]:
+    """Rows for the valid samples in a beacon: {"view", "route", "metrics": [{"name", "value", "target"}]}."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return []
+    if not isinstance(data, dict) or not isinstance(data.get("metrics"), list):
+        return []
+    view = str(data.get("view") or uuid.uuid4().hex)[:64]
+    route = str(data.get("route") or "/")[:100]
+    device = device_class(user_agent)
+    rows = []
+    for sample in data["metrics"][:MAX_SAMPLES]:
+        if not isinstance(sample, dict) or sample.get("name") not in METRICS:
+            continue
+        value = sample.get("value")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if not 0 <= value <= METRICS[sample["name"]]:
+            continue
+        rows.append((now, view, route, device, sample["name"], float(value), str(sample.get("target") or "")[:100]))
+    return rows
+
+
+async def vitals_endpoint(request: Request) -> Response:
+    """Store a beacon of Web Vitals samples from the page."""
+    client = request.client.host if request.client else ""
+    if not limiter.allow("vitals", client):
+        return Response(status_code=429)
+    try:
+        length = int(request.headers.get("content-length", 0))
+    except ValueError:
+        return Response(status_code=400)
+    if length > MAX_BEACON_BYTES:
+        return Response(status_code=413)
+    # Chunked bodies have no length up front; stop reading once over the cap.
+    body = b""
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > MAX_BEACON_BYTES:
+            return Response(status_code=413)
+    rows = parse_beacon(body, request.headers.get("user-agent", ""), time.time())
+    if rows:
+        get_store().add(rows)
+    return Response(status_code=204)
+
+
+async def vitals_summary_endpoint(request: Request) -> Response:
+    """Percentile summaries of the last `days` (default 7) days of samples."""
+    client = request.client.host if request.client else ""
+    if not limiter.allow("vitals_summary", client):
+        return Response(status_code=429)
+    try:
+        days = float(request.query_params.get("days", 7))
+    except ValueError:
+        days = 7.0
+    # The query scans every sample in the range; keep it off the event loop.
+    summary = await asyncio.to_thread(get_store().summary, time.time() - days * 86400)
+    return JSONResponse(summary)
@@ -0,0 +1,43 @@
+import socketio
+from reflex.config import get_config
+from reflex.state import StateManagerRedis
+from reflex.utils import console
+
+
+class EventRelay(socketio.AsyncRedisManager):
+    """Socket.IO client manager that forwards emits through redis only when needed.
+
+    The stock redis manager publishes every emit to every worker. Nearly all
+    of Reflex's emits go to the client whose event is being processed, which
+    is connected to this worker, so those are sent directly.
+    """
+
+    async def emit(self, event, data, namespace=None, room=None, to=None, **kwargs):
+        room = to or room
+        if room is not None and self.is_connected(room, namespace or "/"):
+            kwargs["ignore_queue"] = True
+        return await super().emit(event, data, namespace=namespace, room=room, **kwargs)
+
+
+class SharedState:
+    """App mixin for running several backend workers behind one port.
+
+    With `redis_url` set, Reflex keeps State in redis, so whichever worker
+    gets an event can process it. A browser's websocket stays on the worker
+    it connected to, but after a reconnect (e.g. gunicorn recycling a worker)
+    a background task still running elsewhere emits to the new session id,
+    which lives on another worker; the relay passes it on over redis pub/sub.
+    """
+
+    def _setup_state(self) -> None:
+        super()._setup_state()
+        config = get_config()
+        if isinstance(self._state_manager, StateManagerRedis):
+            relay = EventRelay(config.redis_url)
+            relay.set_server(self.sio)
+            self.sio.manager = relay
+        elif (config.gunicorn_workers or 1) > 1:
+            console.warn(
+                "gunicorn_workers > 1 without redis_url: each worker keeps its own sessions, "
+                "so a visitor who reconnects to another worker starts over."
+            )
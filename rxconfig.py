@@ -1,5 +1,57 @@
+import json
+import os
 import reflex as rx
 
 config = rx.Config(
     app_name="py_portfolio",
-)
\ No newline at end of file
+    # Prerender `/` to static HTML with only the contact form talking to the
+    # backend: PORTFOLIO_STATIC=1 reflex export --frontend-only
+    static_export=os.getenv("PORTFOLIO_STATIC", "0") == "1",
+    # Serve the export, fingerprinted and precompressed by
+    # `python -m py_portfolio.static_site`, from the backend at /:
+    # PORTFOLIO_SITE=site
+    static_site=os.getenv("PORTFOLIO_SITE") or None,
+    # Serve Prometheus metrics on /metrics; PORTFOLIO_METRICS=0 removes all
+    # instrumentation.
+    metrics=os.getenv("PORTFOLIO_METRICS", "1") == "1",
+    # Collect Web Vitals from visitors' browsers at /api/vitals (POST) and
+    # serve percentiles per route and device class there (GET). Off by
+    # default in a static export, where it would be the one backend request
+    # of every page view; PORTFOLIO_VITALS=1 turns it on there too.
+    vitals=os.getenv("PORTFOLIO_VITALS", "0" if os.getenv("PORTFOLIO_STATIC", "0") == "1" else "1") == "1",
+    # Load the sections below the fold (whoami, skills, certifications and
+    # projects, contact) as separate chunks once they near the viewport, with
+    # sized placeholders until then. Their content is then no longer in the
+    # prerendered HTML. PORTFOLIO_LAZY=0 renders them with the page.
+    lazy_sections=os.getenv("PORTFOLIO_LAZY", "1") == "1",
+    # "compositor" animates only transforms/opacity, pauses off-screen loops
+    # and honours prefers-reduced-motion; "classic" is the original styling.
+    animations=os.getenv("PORTFOLIO_ANIMATIONS", "compositor"),
+    # Contact-form flood protection: token buckets per client and per sender
+    # address, and per client for the vitals endpoints. The defaults are
+    # DEFAULT_LIMITS in py_portfolio/ratelimit.py; list only what differs, a
+    # scope as a whole, e.g. {"client": {"capacity": 5, "per_second": 1 / 60}}.
+    # `capacity` is the burst size, `per_second` the refill rate.
+    # PORTFOLIO_RATE_LIMITS (JSON) sets them instead, e.g. {"enabled": false}
+    # for load tests.
+    rate_limits=json.loads(os.getenv("PORTFOLIO_RATE_LIMITS", "{}")),
+    # Repeats of a contact-form submission (same content from the same
+    # session, e.g. a double-click) within `ttl` seconds get the first one's
+    # status instead of a second email. Per backend process.
+    dedup={"ttl": 10 * 60, "max_tracked": 10_000},
+    # Digest delivery: collect contact-form submissions and email them
+    # together once the oldest has waited `window` seconds or `max_size` are
+    # waiting. The form gets an "urgent" box to skip the wait. A window of 0
+    # (the default, or PORTFOLIO_DIGEST_WINDOW=0) sends each one right away.
+    digest={"window": float(os.getenv("PORTFOLIO_DIGEST_WINDOW", "0")), "max_size": 20},
+    # In-memory sessions: dropped after `ttl` idle seconds, least recently
+    # used first once they hold more than `max_bytes`.
+    sessions={"ttl": 30 * 60, "max_bytes": 64 * 2**20},
+    # Several backend workers: set REDIS_URL to keep sessions in redis, shared
+    # by all workers, and GUNICORN_WORKERS to the number of workers. Sessions
+    # there expire after the same idle time as the in-memory ones.
+    redis_token_expiration=30 * 60,
+    # Gzipped first-load JavaScript per route, in bytes; over budget fails
+    # benchmarks/bundle_size.py.
+    bundle_budgets={"/": 350 * 1024, "/404": 300 * 1024},
+)
@@ -0,0 +1,104 @@
+"""Shared fixtures: a local SMTP stand-in, delivery settings pointing at it and a temporary outbox."""
+import asyncio
+import email
+import os
+import socket
+import time
+from email import policy
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from py_portfolio import config, delivery
+from py_portfolio.outbox import Outbox
+
+
+class SMTPStandIn:
+    """aiosmtpd handler that keeps the messages it receives and fails on demand.
+
+    The next `fail` messages are answered with 451, the next `stall` are
+    held for `stall_seconds` first, and logins are rejected with 535 while
+    `reject_login` is set.
+    """
+
+    def __init__(self) -> None:
+        self.sessions = 0
+        self.received: list[email.message.EmailMessage] = []
+        self.attempts: list[float] = []
+        self.fail = 0
+        self.stall = 0
+        self.stall_seconds = 0.0
+        self.reject_login = False
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        # Unhandled, so aiosmtpd answers a rejected login with 535 itself.
+        return AuthResult(success=not self.reject_login, handled=False)
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.sessions += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.attempts.append(time.monotonic())
+        if self.stall:
+            self.stall -= 1
+            await asyncio.sleep(self.stall_seconds)
+        if self.fail:
+            self.fail -= 1
+            return "451 4.3.0 Try again later"
+        self.received.append(email.message_from_bytes(envelope.content, policy=policy.default))
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    """A running SMTP stand-in, with the contact-form settings pointing at it."""
+    server = SMTPStandIn()
+    port = free_port()
+    monkeypatch.setenv("SMTP_HOST", "127.0.0.1")
+    monkeypatch.setenv("SMTP_PORT", str(port))
+    monkeypatch.setenv("SMTP_STARTTLS", "0")
+    monkeypatch.setenv("GMAIL_ADDRESS", "delivery@example.com")
+    monkeypatch.setenv("GMAIL_APP_PASSWORD", "delivery")
+    monkeypatch.setenv("RECEIVER_EMAIL", "inbox@example.com")
+    # A loader without an env file, so a developer's .env can't redirect the tests.
+    loader = config.SettingsLoader(os.devnull)
+    monkeypatch.setattr(config, "settings", loader)
+    monkeypatch.setattr(delivery, "settings", loader)
+    controller = Controller(
+        server, hostname="127.0.0.1", port=port, authenticator=server.authenticate, auth_require_tls=False
+    )
+    controller.start()
+    yield server
+    delivery.get_pool(loader.get()).close()
+    controller.stop()
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    box = Outbox(str(tmp_path / "outbox.db"))
+    yield box
+    box.close()
+
+
+@pytest.fixture
+def make_queue(monkeypatch, outbox):
+    """Return a factory for the app's delivery queue on the temporary outbox.
+
+    The queue replaces `delivery.queue`, so `delivery.lifespan()` runs it.
+    """
+
+    def make(**options) -> delivery.DeliveryQueue:
+        queue = delivery.DeliveryQueue(outbox=outbox, shared=False, **options)
+        monkeypatch.setattr(delivery, "queue", queue)
+        return queue
+
+    return make
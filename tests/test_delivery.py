@@ -0,0 +1,79 @@
+"""Retries, backoff and give-ups of contact-form delivery against the SMTP stand-in."""
+import asyncio
+import sqlite3
+
+from py_portfolio import delivery
+
+TIMEOUT = 0.5
+BACKOFF = 0.2
+RETRIES = 3
+
+
+def deliver(queue: delivery.DeliveryQueue, case: str) -> str:
+    """Send one submission through the running queue and return its final status."""
+    submission = delivery.Submission(name=f"Visitor ({case})", email="visitor@example.com", message=f"Checking {case}.")
+
+    async def run() -> str:
+        async with delivery.lifespan():
+            # Generous: every backoff step plus a stalled attempt each.
+            return await asyncio.wait_for(queue.wait(queue.enqueue(submission)), BACKOFF * 2**RETRIES + 4 * RETRIES)
+
+    return asyncio.run(run())
+
+
+def gaps(attempts: list[float]) -> list[float]:
+    return [b - a for a, b in zip(attempts, attempts[1:])]
+
+
+def test_sends(smtp_server, make_queue):
+    status = deliver(make_queue(timeout=TIMEOUT), "success")
+    assert status == delivery.STATUS_SENT
+    assert len(smtp_server.received) == 1
+
+
+def test_retries_transient_errors_with_backoff(smtp_server, make_queue):
+    smtp_server.fail = RETRIES - 1
+    status = deliver(make_queue(timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF), "transient")
+    assert status == delivery.STATUS_SENT
+    assert len(smtp_server.attempts) == RETRIES
+    for attempt, gap in enumerate(gaps(smtp_server.attempts)):
+        assert gap >= BACKOFF * 2**attempt * 0.9
+
+
+def test_retries_after_timeout(smtp_server, make_queue):
+    smtp_server.stall = 1
+    smtp_server.stall_seconds = TIMEOUT * 3
+    status = deliver(make_queue(timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF), "timeout")
+    assert status == delivery.STATUS_SENT
+    assert len(smtp_server.attempts) == 2
+
+
+def test_gives_up_after_retries(smtp_server, make_queue):
+    smtp_server.fail = RETRIES + 5
+    status = deliver(make_queue(timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF), "permanent")
+    assert status.startswith("Failed to send") and "451" in status
+    assert len(smtp_server.attempts) == RETRIES
+
+
+def test_rejected_login_is_not_retried(smtp_server, make_queue):
+    smtp_server.reject_login = True
+    status = deliver(make_queue(timeout=TIMEOUT, retries=RETRIES, backoff=BACKOFF), "auth")
+    assert "535" in status
+    # smtplib tries each mechanism the server offers within one session.
+    assert smtp_server.sessions == 1
+
+
+def test_worker_survives_outbox_errors(smtp_server, make_queue, monkeypatch):
+    queue = make_queue(timeout=TIMEOUT, backoff=BACKOFF)
+    claim = queue.outbox.claim
+    locked = [2]
+
+    def flaky_claim(*args, **kwargs):
+        if locked[0]:
+            locked[0] -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return claim(*args, **kwargs)
+
+    monkeypatch.setattr(queue.outbox, "claim", flaky_claim)
+    assert deliver(queue, "locked") == delivery.STATUS_SENT
+    assert not locked[0]
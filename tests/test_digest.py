@@ -0,0 +1,79 @@
+"""Digest delivery against the SMTP stand-in: where batches split and what each email holds."""
+import asyncio
+import time
+
+import pytest
+
+from py_portfolio import delivery
+
+WINDOW = 0.5
+MAX_SIZE = 5
+HOSTILE_NAME = 'Mallory <script>alert("hi")</script>\r\nBcc: victim@example.com'
+
+
+def submission(i: int) -> delivery.Submission:
+    return delivery.Submission(name=f"Visitor {i}", email=f"visitor{i}@example.com", message=f"Message number {i}, " * 3)
+
+
+async def settle(queue: delivery.DeliveryQueue, job_ids: list[str], timeout: float) -> float:
+    """Wait for jobs to be delivered, returning how long that took."""
+    started = time.perf_counter()
+    await asyncio.wait_for(asyncio.gather(*(queue.wait(job_id) for job_id in job_ids)), timeout)
+    return time.perf_counter() - started
+
+
+def batch_sizes(messages) -> list[int]:
+    return sorted((message.get_body(("plain",)).get_content().count("--- ") for message in messages), reverse=True)
+
+
+@pytest.fixture
+def queue(smtp_server, make_queue):
+    return make_queue(digest={"window": WINDOW, "max_size": MAX_SIZE})
+
+
+def test_partial_batch_waits_for_the_window(smtp_server, queue):
+    async def run() -> float:
+        async with delivery.lifespan():
+            return await settle(queue, [queue.enqueue(submission(i)) for i in range(MAX_SIZE - 1)], WINDOW * 4)
+
+    elapsed = asyncio.run(run())
+    assert batch_sizes(smtp_server.received) == [MAX_SIZE - 1]
+    assert elapsed >= WINDOW * 0.9
+
+
+def test_full_batch_goes_out_at_once(smtp_server, queue):
+    async def run() -> None:
+        async with delivery.lifespan():
+            jobs = [queue.enqueue(submission(i)) for i in range(MAX_SIZE + 2)]
+            await settle(queue, jobs[:MAX_SIZE], WINDOW / 2)
+            # The rest of an overflowing batch waits for the window.
+            assert len(smtp_server.received) == 1
+            await settle(queue, jobs[MAX_SIZE:], WINDOW * 4)
+
+    asyncio.run(run())
+    assert batch_sizes(smtp_server.received) == [MAX_SIZE, 2]
+
+
+def test_urgent_skips_the_batch(smtp_server, queue):
+    async def run() -> None:
+        async with delivery.lifespan():
+            held = [queue.enqueue(submission(i)) for i in range(2)]
+            urgent = queue.enqueue(
+                delivery.Submission(name=HOSTILE_NAME, email="m@example.com", message="<b>Help</b> & now", urgent=True)
+            )
+            await settle(queue, [urgent], WINDOW / 2)
+            assert len(smtp_server.received) == 1
+            await settle(queue, held, WINDOW * 4)
+
+    asyncio.run(run())
+    assert len(smtp_server.received) == 2
+    message = smtp_server.received[0]
+    assert message.get_content_type() == "multipart/alternative"
+    text = message.get_body(("plain",)).get_content()
+    html = message.get_body(("html",)).get_content()
+    assert "<b>Help</b> & now" in text
+    assert "&lt;script&gt;" in html and "<script>" not in html
+    assert "&lt;b&gt;Help&lt;/b&gt; &amp; now" in html
+    assert message["Bcc"] is None and "\n" not in message["Subject"]
+    for received in smtp_server.received:
+        assert {part.get_content_type() for part in received.iter_parts()} == {"text/plain", "text/html"}
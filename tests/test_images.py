@@ -0,0 +1,96 @@
+"""The project image build, offline, on generated fixture images."""
+import re
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from PIL import Image, features
+
+from py_portfolio import images
+
+EXIF_ORIENTATION = 0x0112
+FORMATS = [fmt for fmt in images.FORMATS if features.check(fmt)]
+
+
+@pytest.fixture
+def sources(tmp_path) -> dict[str, tuple[int, int]]:
+    """Write the fixture images and return the size each should display at once upright."""
+    photo = tmp_path / "photo.jpg"
+    Image.radial_gradient("L").resize((1200, 800)).convert("RGB").save(photo, quality=90)
+
+    # Stored 1200x800 but tagged "rotate 90", so it displays 800x1200.
+    sideways = tmp_path / "sideways.jpg"
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = 6
+    Image.linear_gradient("L").resize((1200, 800)).convert("RGB").save(sideways, quality=90, exif=exif)
+
+    # Smaller than every width, so it must not be upscaled.
+    icon = tmp_path / "icon.png"
+    Image.new("RGBA", (200, 100), (0, 128, 255, 128)).save(icon)
+    return {str(photo): (1200, 800), str(sideways): (800, 1200), str(icon): (200, 100)}
+
+
+@pytest.fixture
+def encoded(monkeypatch) -> list[str]:
+    """The digests of the images encoded since the test started."""
+    encoded = []
+    build_image = images.build_image
+
+    def counting_build_image(data, digest, output_dir, widths=images.WIDTHS):
+        encoded.append(digest)
+        return build_image(data, digest, output_dir, widths)
+
+    monkeypatch.setattr(images, "build_image", counting_build_image)
+    return encoded
+
+
+def test_variants_match_the_manifest(sources, tmp_path):
+    output_dir = tmp_path / "projects"
+    manifest = images.build(list(sources), output_dir)
+    for source, (width, height) in sources.items():
+        entry = manifest[source]
+        expected = sorted({min(w, width) for w in images.WIDTHS})
+        for fmt in FORMATS:
+            assert [w for w, _ in entry["variants"][fmt]] == expected
+            for w, url in entry["variants"][fmt]:
+                with Image.open(output_dir / Path(url).name) as variant:
+                    assert variant.size == (w, round(height * w / width))
+        size = (entry["width"], entry["height"])
+        assert size == (expected[-1], round(height * expected[-1] / width))
+
+        html = str(images.project_image(source, alt="fixture", manifest=manifest))
+        srcsets = re.findall(r'srcSet=\{"([^"]*)"\}', html)
+        assert len(srcsets) == len(FORMATS)
+        for srcset in srcsets:
+            assert [int(w) for w in re.findall(r" (\d+)w", srcset)] == expected
+        assert f"width={{{size[0]}}}" in html and f"height={{{size[1]}}}" in html
+        assert 'loading={"lazy"}' in html
+
+
+def test_second_build_reuses_variants(sources, encoded, tmp_path):
+    output_dir = tmp_path / "projects"
+    manifest = images.build(list(sources), output_dir)
+    assert len(encoded) == len(sources)
+    # manifest.json is rewritten on every build; the variants must not be.
+    files = {path.name: path.stat().st_mtime_ns for path in output_dir.glob("*-*.*")}
+
+    encoded.clear()
+    assert images.build(list(sources), output_dir) == manifest
+    assert not encoded
+    assert {path.name: path.stat().st_mtime_ns for path in output_dir.glob("*-*.*")} == files
+
+
+def test_changed_image_is_rebuilt(sources, encoded, tmp_path):
+    output_dir = tmp_path / "projects"
+    manifest = images.build(list(sources), output_dir)
+    icon = next(source for source in sources if source.endswith(".png"))
+    buffer = BytesIO()
+    Image.new("RGBA", (200, 100), (255, 0, 0, 255)).save(buffer, "PNG")
+    Path(icon).write_bytes(buffer.getvalue())
+
+    encoded.clear()
+    changed = images.build(list(sources), output_dir)
+    assert len(encoded) == 1
+    assert changed[icon]["hash"] != manifest[icon]["hash"]
+    old = {Path(url).name for variants in manifest[icon]["variants"].values() for _, url in variants}
+    assert not any((output_dir / name).exists() for name in old)
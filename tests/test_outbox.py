@@ -0,0 +1,15 @@
+"""Row lifecycle of the contact-form outbox."""
+from py_portfolio.outbox import Outbox
+
+
+def test_purges_only_old_delivered_rows(outbox: Outbox):
+    delivered, failed, pending = (outbox.add(f"Visitor {i}", "v@example.com", "Hello there") for i in range(3))
+    outbox.claim(3)
+    outbox.mark_delivered([delivered])
+    outbox.fail(failed, "550 rejected")
+    outbox.retry(pending, "451 try again", 0)
+
+    assert outbox.purge_delivered(retention=60) == 0
+    assert outbox.purge_delivered(retention=-1) == 1
+    assert outbox.status(delivered) is None
+    assert outbox.counts() == {"failed": 1, "pending": 1}
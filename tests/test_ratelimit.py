@@ -0,0 +1,22 @@
+"""Token-bucket limits of the contact form and vitals endpoints."""
+import pytest
+
+from py_portfolio.ratelimit import RateLimiter
+
+
+def test_bucket_allows_its_capacity():
+    limiter = RateLimiter({"client": {"capacity": 3, "per_second": 0}})
+    assert [limiter.allow("client", "a") for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow("client", "b")
+    assert limiter.rejected == {"client": 1}
+
+
+def test_disabled_allows_everything():
+    limiter = RateLimiter({"enabled": False, "client": {"capacity": 1, "per_second": 0}})
+    assert all(limiter.allow("client", "a") for _ in range(10))
+
+
+@pytest.mark.parametrize("max_tracked", [0, -1])
+def test_max_tracked_must_hold_a_bucket(max_tracked):
+    with pytest.raises(ValueError):
+        RateLimiter({"max_tracked": max_tracked})
@@ -0,0 +1,89 @@
+"""Caching headers of the built site and what a cold load and a warm reload transfer."""
+import asyncio
+import re
+
+import httpx
+import pytest
+
+from py_portfolio import static_site
+
+# Bodies are never decoded, so brotli needn't be installed here.
+ACCEPT_ENCODING = "br, gzip"
+REFERENCE = re.compile(r"""(?:src|href)=["'](/[^"'#?]+)""")
+
+
+def write_export(directory):
+    """A page shaped like a Next export: a prehashed bundle and unhashed public assets."""
+    chunks = directory / "_next" / "static" / "chunks"
+    chunks.mkdir(parents=True)
+    (chunks / "main-4f1c2d9e8a7b6c5d.js").write_text("console.log('portfolio');\n" * 400)
+    (directory / "favicon.ico").write_bytes((static_site.ROOT_DIR / "assets" / "favicon.ico").read_bytes())
+    (directory / "shared.css").write_text("body{margin:0}\n" * 100)
+    (directory / "index.html").write_text(
+        '<!DOCTYPE html><html><head><link rel="icon" href="/favicon.ico"/>'
+        '<link rel="stylesheet" href="/shared.css"/></head><body>'
+        + "<p>Portfolio</p>" * 200
+        + '<script src="/_next/static/chunks/main-4f1c2d9e8a7b6c5d.js"></script></body></html>'
+    )
+    return directory
+
+
+@pytest.fixture
+def site_dir(tmp_path):
+    site_dir = tmp_path / "site"
+    static_site.build(write_export(tmp_path / "export"), site_dir)
+    return site_dir
+
+
+def load(site: static_site.StaticSite, urls: list[str], headers: dict[str, dict] | None = None) -> dict:
+    """GET each url, returning the response and the body bytes on the wire (before decoding) per url."""
+
+    async def run() -> dict:
+        responses = {}
+        transport = httpx.ASGITransport(app=site)
+        async with httpx.AsyncClient(transport=transport, base_url="http://portfolio") as client:
+            for url in urls:
+                request_headers = {"Accept-Encoding": ACCEPT_ENCODING, **(headers or {}).get(url, {})}
+                async with client.stream("GET", url, headers=request_headers) as response:
+                    wire = b"".join([chunk async for chunk in response.aiter_raw()])
+                responses[url] = (response, len(wire))
+        return responses
+
+    return asyncio.run(run())
+
+
+def page_urls(site_dir) -> list[str]:
+    return ["/", *dict.fromkeys(REFERENCE.findall((site_dir / "index.html").read_text()))]
+
+
+def test_cold_load_headers(site_dir):
+    site = static_site.StaticSite(site_dir)
+    urls = page_urls(site_dir)
+    assert all(site.files.get(site.resolve(url), {}).get("immutable") for url in urls[1:])
+    for url, (response, _) in load(site, urls).items():
+        entry = site.files[site.resolve(url)]
+        cache_control = response.headers.get("cache-control", "")
+        assert response.status_code == 200
+        if entry.get("immutable"):
+            assert "immutable" in cache_control and "max-age=31536000" in cache_control
+        else:
+            assert cache_control == "no-cache"
+        assert response.headers.get("etag")
+        if entry.get("encodings"):
+            assert response.headers.get("vary") == "Accept-Encoding"
+            assert response.headers.get("content-encoding") in entry["encodings"]
+
+
+def test_warm_reload_revalidates(site_dir):
+    site = static_site.StaticSite(site_dir)
+    cold = load(site, page_urls(site_dir))
+    # A browser takes immutable assets straight from its cache.
+    revalidated = {
+        url: {"If-None-Match": response.headers["etag"]}
+        for url, (response, _) in cold.items()
+        if "immutable" not in response.headers.get("cache-control", "")
+    }
+    assert list(revalidated) == ["/"]
+    warm = load(site, list(revalidated), revalidated)
+    assert all(response.status_code == 304 for response, _ in warm.values())
+    assert sum(size for _, size in warm.values()) < sum(size for _, size in cold.values()) / 10